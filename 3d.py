@@ -1,13 +1,19 @@
 import streamlit as st
 
+from bita.viewer3d import render_table, render_viewer, select_dataset, select_region
+
 st.set_page_config(layout="wide")
 
 ## 🏛️ Header and Sidebar
 with st.sidebar:
     st.header("⚙️ 3D Model Controls")
-    st.slider("Model Rotation (X-Axis)", 0, 360, 45)
-    st.color_picker("Base Material Color", "#4682B4")
+    rotation_x = st.slider("Model Rotation (X-Axis)", 0, 360, 45)
+    base_color = st.color_picker("Base Material Color", "#4682B4")
     st.button("Reset View", use_container_width=True)
+    # Uploads are streamed into a binary cache keyed by file hash (bita/viewer3d/ingest.py).
+    dataset = select_dataset()
+    # Box / radius / nearest-point queries on a grid index (bita/viewer3d/spatial.py) narrow both tabs.
+    region = select_region(dataset)
 
 st.title("🌐 Advanced 3D Viewer Dashboard")
 st.markdown("Use the navigation below to explore different views of the 3D model data.")
@@ -17,26 +23,22 @@ tab1, tab2, tab3 = st.tabs(["3D View", "Data Table", "Settings"])
 
 with tab1:
     st.header("Interactive 3D Render")
-    # Placeholder for the actual 3D content (like a Plotly or Pydeck chart)
-    st.empty().write("[Placeholder: Interactive 3D Visualization goes here]")
+    # Level-of-detail point cloud (bita/viewer3d): only the points for the current budget reach the browser.
+    # The checkbox lives in the Settings tab below, so read its last value from session state.
+    render_viewer(rotation_x, base_color, high_res=st.session_state.get("high_res", False), dataset=dataset, region=region)
     st.info("Tip: Use the sidebar to change the model's properties.")
 
 with tab2:
     st.header("Source Data")
-    # Placeholder for a data table
-    st.dataframe({
-        'ID': [1, 2, 3], 
-        'X_Pos': [10.5, 22.1, 5.9], 
-        'Y_Pos': [5.0, 11.2, 8.8],
-        'Z_Height': [150.0, 120.5, 180.2]
-    })
+    # Server-side sorted, filtered and paginated (bita/viewer3d/table.py): only the visible page is serialized.
+    render_table(dataset, region)
 
 with tab3:
     st.header("Application Preferences")
     colA, colB = st.columns(2)
     with colA:
         st.subheader("Performance")
-        st.checkbox("Enable High Resolution Rendering", value=False)
+        st.checkbox("Enable High Resolution Rendering", value=False, key="high_res")
     with colB:
         st.subheader("Theme")
         st.radio("Choose App Theme", ["Light", "Dark", "System Default"])
\ No newline at end of file
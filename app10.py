@@ -1,23 +1,24 @@
 import streamlit as st
-import base64
+
+from bita.media import get_background, video_background_html
+from bita.static import install_static_headers
 
 # --- Page Config ---
 st.set_page_config(page_title="Transparent Glass UI", layout="wide")
 
-# --- Load Local Background Image ---
-def get_base64(file):
-    with open(file, "rb") as f:
-        data = f.read()
-    return base64.b64encode(data).decode()
+# Cache headers for static/ (bita/static.py).
+install_static_headers()
 
-bg_image = get_base64("Untitled.gif")
+# --- Load Local Background Media ---
+# Served from static/ (bita/media.py).
+bg = get_background("Untitled.gif")
 
 # --- Custom CSS ---
 st.markdown(f"""
 <style>
 /* Full-page background image */
 [data-testid="stAppViewContainer"] {{
-    background: url("data:image/jpg;base64,{bg_image}");
+    background: url("{bg.url}");
     background-size: cover;
     background-position: center;
     background-attachment: fixed;
@@ -72,6 +73,7 @@ st.markdown(f"""
     background: linear-gradient(90deg, #6a5cff, #9c87ff);
 }}
 </style>
+{video_background_html(bg)}
 """, unsafe_allow_html=True)
 
 # --- UI Layout ---
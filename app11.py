@@ -1,23 +1,24 @@
 import streamlit as st
-import base64
+
+from bita.media import get_background, video_background_html
+from bita.static import install_static_headers
 
 # --- Page Config ---
 st.set_page_config(page_title="Porsche 911 Style UI", layout="wide")
 
-# --- Load Local Background Image ---
-def get_base64(file):
-    with open(file, "rb") as f:
-        data = f.read()
-    return base64.b64encode(data).decode()
+# Cache headers for static/ (bita/static.py).
+install_static_headers()
 
-bg_image = get_base64("download.png")  # Replace with your image file
+# --- Load Local Background Media ---
+# Served from static/ (bita/media.py).
+bg = get_background("download.png")  # Replace with your image file
 
 # --- Custom CSS ---
 st.markdown(f"""
 <style>
 /* Full-page background */
 [data-testid="stAppViewContainer"] {{
-    background: url("data:image/png;base64,{bg_image}") no-repeat center center fixed;
+    background: url("{bg.url}") no-repeat center center fixed;
     background-size: cover;
     color: white;
     font-family: 'Poppins', sans-serif;
@@ -94,6 +95,7 @@ st.markdown(f"""
     transform: scale(1.05);
 }}
 </style>
+{video_background_html(bg)}
 """, unsafe_allow_html=True)
 
 # --- UI Layout ---
@@ -1,5 +1,7 @@
 import streamlit as st
-import base64
+
+from bita.media import get_background, video_background_html
+from bita.static import install_static_headers
 
 # --- Page Config ---
 st.set_page_config(
@@ -8,13 +10,12 @@ st.set_page_config(
     layout="wide"
 )
 
-# --- Load Local Background Image ---
-def get_base64(file):
-    with open(file, "rb") as f:
-        data = f.read()
-    return base64.b64encode(data).decode()
+# Cache headers for static/ (bita/static.py).
+install_static_headers()
 
-bg_image = get_base64("banner.gif")
+# --- Load Local Background Media ---
+# Served from static/ (bita/media.py).
+bg = get_background("banner.gif")
 
 # --- Custom CSS ---
 st.markdown(f"""
@@ -28,7 +29,7 @@ body {{
 
 /* Background GIF scrolling with page */
 [data-testid="stAppViewContainer"] {{
-    background: url("data:image/gif;base64,{bg_image}");
+    background: url("{bg.url}");
     background-size: cover;
     background-position: center;
     background-repeat: no-repeat;
@@ -136,6 +137,7 @@ body {{
     background: linear-gradient(90deg, #6a5cff, #9c87ff);
 }}
 </style>
+{video_background_html(bg)}
 
 <!-- Glass Navbar HTML -->
 <div class="navbar">
@@ -0,0 +1,278 @@
+"""Localhost load test: many concurrent Streamlit websocket sessions against one server.
+
+    python benchmarks/load_test.py [--script app.py] [--sessions 200] [--ramp 10] [--reruns 3]
+                                   [--fetch-static] [--warm] [--output load.json]
+    python benchmarks/load_test.py --port 8501 --pid 12345 ...   # an already running local server
+
+By default the tool starts its own headless server for ``--script`` on a
+free localhost port (``--warm`` starts it through ``bita.warmup run``),
+waits for ``/_stcore/health`` and stops it afterwards. Every session then
+speaks the browser's protocol over ``/_stcore/stream``:
+
+1. initial render: a ``rerun_script`` message, timed to the first delta
+   (time-to-first-delta) and to ``script_finished``;
+2. ``--reruns`` further reruns with ``--think`` seconds between them, the
+   way a widget interaction reruns the page;
+3. with ``--fetch-static``, a GET of every ``app/static/...`` URL the page
+   references, i.e. what scrolling through the lazy slides downloads.
+
+The report has p50/p95/p99 latencies, bytes per session, errors, and the
+server's peak RSS and CPU sampled from /proc. Nothing leaves localhost.
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from streamlit.proto.BackMsg_pb2 import BackMsg  # noqa: E402
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg  # noqa: E402
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError  # noqa: E402
+from tornado.websocket import websocket_connect  # noqa: E402
+
+HOST = "127.0.0.1"
+STATIC_URL_RE = re.compile(r"""app/static/[^\s"'()<>,]+""")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+# --- Server ---
+def free_port():
+    with socket.socket() as s:
+        s.bind((HOST, 0))
+        return s.getsockname()[1]
+
+
+def start_server(script, port, warm):
+    launcher = [sys.executable, "-m", "bita.warmup", "run", "--"] if warm else [sys.executable, "-m", "streamlit", "run"]
+    return subprocess.Popen(
+        launcher + [script, "--server.headless", "true", "--server.port", str(port),
+                    "--server.address", HOST, "--browser.gatherUsageStats", "false"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_healthy(base_url, timeout=120):
+    client = AsyncHTTPClient()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            response = await client.fetch(f"{base_url}/_stcore/health", request_timeout=2)
+            if response.body.strip() == b"ok":
+                return
+        except (HTTPClientError, OSError):
+            pass
+        await asyncio.sleep(0.2)
+    raise SystemExit(f"server at {base_url} did not become healthy within {timeout} s")
+
+
+class ProcSampler:
+    """Samples RSS and CPU time of ``pid`` from /proc while the load runs."""
+
+    def __init__(self, pid, interval=0.5):
+        self.pid = pid
+        self.interval = interval
+        self.peak_rss = 0
+        self.samples = []  # (monotonic, cpu seconds)
+
+    def _read(self):
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        cpu = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS  # utime + stime
+        with open(f"/proc/{self.pid}/status") as f:
+            rss = next(int(line.split()[1]) * 1024 for line in f if line.startswith("VmRSS:"))
+        return cpu, rss
+
+    async def run(self):
+        while True:
+            try:
+                cpu, rss = self._read()
+            except (OSError, StopIteration):
+                return
+            self.samples.append((time.monotonic(), cpu))
+            self.peak_rss = max(self.peak_rss, rss)
+            await asyncio.sleep(self.interval)
+
+    def report(self):
+        if len(self.samples) < 2:
+            return {"peak_rss_bytes": self.peak_rss or None, "cpu_percent": None}
+        (t0, c0), (t1, c1) = self.samples[0], self.samples[-1]
+        return {"peak_rss_bytes": self.peak_rss, "cpu_percent": 100 * (c1 - c0) / (t1 - t0)}
+
+
+# --- Sessions ---
+def rerun_message():
+    message = BackMsg()
+    message.rerun_script.query_string = ""
+    message.rerun_script.page_script_hash = ""
+    return message.SerializeToString()
+
+
+async def render(ws, timeout):
+    """Request one script run; returns (seconds to first delta, seconds to finish, bytes, static URLs)."""
+    start = time.perf_counter()
+    await ws.write_message(rerun_message(), binary=True)
+    first_delta = None
+    received = 0
+    urls = set()
+    while True:
+        raw = await asyncio.wait_for(ws.read_message(), timeout)
+        if raw is None:
+            raise ConnectionError("websocket closed by the server")
+        received += len(raw)
+        message = ForwardMsg()
+        message.ParseFromString(raw)
+        kind = message.WhichOneof("type")
+        if kind == "delta":
+            if first_delta is None:
+                first_delta = time.perf_counter() - start
+            element = message.delta.new_element
+            if element.WhichOneof("type") == "markdown":
+                urls.update(STATIC_URL_RE.findall(element.markdown.body))
+        elif kind == "script_finished":
+            return first_delta, time.perf_counter() - start, received, urls
+
+
+async def fetch_static(base_url, urls, timeout):
+    client = AsyncHTTPClient()
+    total = 0
+    for url in sorted(urls):
+        response = await client.fetch(f"{base_url}/{url.replace('&amp;', '&')}", request_timeout=timeout)
+        total += len(response.body)
+    return total
+
+
+async def session(index, args, base_url, results):
+    await asyncio.sleep(args.ramp * index / max(args.sessions, 1))
+    record = {"ttfd": [], "render": [], "ws_bytes": 0, "static_bytes": 0, "error": None}
+    results.append(record)
+    try:
+        ws = await websocket_connect(f"{base_url.replace('http', 'ws', 1)}/_stcore/stream")
+        try:
+            urls = set()
+            for run in range(1 + args.reruns):
+                if run:
+                    await asyncio.sleep(args.think)
+                first_delta, finished, received, found = await render(ws, args.timeout)
+                record["ttfd"].append(first_delta if first_delta is not None else finished)
+                record["render"].append(finished)
+                record["ws_bytes"] += received
+                urls |= found
+            if args.fetch_static:
+                record["static_bytes"] = await fetch_static(base_url, urls, args.timeout)
+        finally:
+            ws.close()
+    except Exception as e:
+        record["error"] = f"{e.__class__.__name__}: {e}"
+
+
+# --- Report ---
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, round(q / 100 * len(values) + 0.5) - 1))]
+
+
+def summarize(results, elapsed, server):
+    ok = [r for r in results if r["error"] is None]
+    first_ttfd = [r["ttfd"][0] for r in ok if r["ttfd"]]
+    first_render = [r["render"][0] for r in ok if r["render"]]
+    reruns = [t for r in ok for t in r["render"][1:]]
+    summary = {
+        "sessions": len(results),
+        "errors": len(results) - len(ok),
+        "elapsed_s": elapsed,
+        "renders_per_s": sum(len(r["render"]) for r in ok) / elapsed if elapsed else None,
+        "ws_bytes_per_session": sum(r["ws_bytes"] for r in ok) / len(ok) if ok else None,
+        "static_bytes_per_session": sum(r["static_bytes"] for r in ok) / len(ok) if ok else None,
+    }
+    for name, values in (("ttfd", first_ttfd), ("first_render", first_render), ("rerun", reruns)):
+        for q in (50, 95, 99):
+            value = percentile(values, q)
+            summary[f"{name}_p{q}_ms"] = value * 1000 if value is not None else None
+    summary.update(server)
+    summary["error_samples"] = sorted({r["error"] for r in results if r["error"]})[:5]
+    return summary
+
+
+def print_summary(summary):
+    def ms(key):
+        value = summary[key]
+        return f"{value:8.1f}" if value is not None else "       -"
+
+    print(f"sessions {summary['sessions']}, errors {summary['errors']}, "
+          f"{summary['elapsed_s']:.1f} s, {summary['renders_per_s'] or 0:.1f} renders/s")
+    print(f"{'ms':<16}{'p50':>8}{'p95':>8}{'p99':>8}")
+    for name in ("ttfd", "first_render", "rerun"):
+        print(f"{name:<16}{ms(name + '_p50_ms')}{ms(name + '_p95_ms')}{ms(name + '_p99_ms')}")
+    if summary["ws_bytes_per_session"] is not None:
+        print(f"bytes/session: {summary['ws_bytes_per_session']:,.0f} websocket, "
+              f"{summary['static_bytes_per_session']:,.0f} static")
+    if summary.get("peak_rss_bytes"):
+        cpu = summary["cpu_percent"]
+        print(f"server: peak RSS {summary['peak_rss_bytes'] / 2 ** 20:,.1f} MiB"
+              + (f", CPU {cpu:.0f}%" if cpu is not None else ""))
+    for error in summary["error_samples"]:
+        print(f"error: {error}")
+
+
+async def run_load(args):
+    AsyncHTTPClient.configure(None, max_clients=max(10, args.sessions))
+    port = args.port or free_port()
+    base_url = f"http://{HOST}:{port}"
+    server = start_server(args.script, port, args.warm) if not args.port else None
+    pid = server.pid if server else args.pid
+    try:
+        started = time.perf_counter()
+        await wait_healthy(base_url)
+        if server:
+            print(f"server ready in {time.perf_counter() - started:.1f} s (pid {pid})")
+        sampler = ProcSampler(pid) if pid else None
+        sampling = asyncio.ensure_future(sampler.run()) if sampler else None
+
+        results = []
+        start = time.perf_counter()
+        await asyncio.gather(*(session(i, args, base_url, results) for i in range(args.sessions)))
+        elapsed = time.perf_counter() - start
+        if sampling:
+            sampling.cancel()
+        return summarize(results, elapsed, sampler.report() if sampler else {})
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--script", default="app.py", help="page to serve (default: %(default)s)")
+    parser.add_argument("--sessions", type=int, default=100, help="concurrent sessions (default: %(default)s)")
+    parser.add_argument("--ramp", type=float, default=5.0, help="seconds over which sessions start")
+    parser.add_argument("--reruns", type=int, default=2, help="reruns per session after the first render")
+    parser.add_argument("--think", type=float, default=1.0, help="seconds between reruns")
+    parser.add_argument("--fetch-static", action="store_true", help="also download referenced static files")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-render timeout in seconds")
+    parser.add_argument("--warm", action="store_true", help="start the server through bita.warmup run")
+    parser.add_argument("--port", type=int, help="use a server already listening on this localhost port")
+    parser.add_argument("--pid", type=int, help="with --port: server pid for RSS/CPU sampling")
+    parser.add_argument("--output", help="write the summary as JSON to this file")
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(run_load(args))
+    print_summary(summary)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
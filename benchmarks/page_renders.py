@@ -0,0 +1,213 @@
+"""Render benchmark for every page, driven through ``AppTest``.
+
+    python benchmarks/page_renders.py [--runs 10] [--pages home,ourstar] [--output out.json]
+    python benchmarks/page_renders.py --compare benchmarks/results/before.json
+
+Each run is a fresh ``AppTest`` session in one process: the first run of a
+page pays the process-wide cold start (cache_resource, built assets), the
+rest show what every later visitor costs. Per run we record wall time,
+element count, delta bytes (serialized protos, grouped by element type) and
+media bytes (files handed to the media manager, e.g. ``st.image``). One
+extra run per page under tracemalloc records peak Python memory; tracing
+slows the script down, so it is not part of the timings.
+
+Results go to ``benchmarks/results/pages-<timestamp>.json``. ``--compare``
+prints the change against an earlier file and exits 1 when a byte or
+element count grows by more than ``--threshold`` or a median wall time by
+more than ``--time-threshold`` (timings are noisier).
+"""
+import argparse
+import collections
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+PAGES = {
+    "home": "app.py",
+    "ourstar": "pages/ourstar.py",
+    "app9": "app9.py",
+    "app10": "app10.py",
+    "app11": "app11.py",
+    "3d": "3d.py",
+}
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+# Metrics compared by --compare; a higher value is worse for all of them.
+COMPARED = ("wall_ms_median", "delta_bytes", "media_bytes", "elements")
+
+
+class MediaCounter:
+    """Counts bytes stored through the media manager (st.image, st.video, ...)."""
+
+    def __init__(self):
+        self.bytes = 0
+        self._load = MemoryMediaFileStorage.load_and_get_id
+
+    def __enter__(self):
+        counter = self
+
+        def load_and_get_id(storage, path_or_data, *args, **kwargs):
+            if isinstance(path_or_data, bytes):
+                counter.bytes += len(path_or_data)
+            elif isinstance(path_or_data, str) and os.path.exists(path_or_data):
+                counter.bytes += os.path.getsize(path_or_data)
+            return counter._load(storage, path_or_data, *args, **kwargs)
+
+        MemoryMediaFileStorage.load_and_get_id = load_and_get_id
+        return self
+
+    def __exit__(self, *exc):
+        MemoryMediaFileStorage.load_and_get_id = self._load
+
+
+def walk(node, by_type):
+    """Add each element's serialized size under its type; returns the element count."""
+    children = getattr(node, "children", None)
+    if children is not None:
+        return sum(walk(child, by_type) for child in children.values())
+    proto = getattr(node, "proto", None)
+    if proto is None:
+        return 0
+    by_type[node.type] += proto.ByteSize()
+    return 1
+
+
+def run_once(script):
+    with MediaCounter() as media:
+        start = time.perf_counter()
+        at = AppTest.from_file(script, default_timeout=120).run()
+        wall = time.perf_counter() - start
+    by_type = collections.Counter()
+    elements = walk(at._tree, by_type)
+    error = f"{at.exception[0].value}" if at.exception else None
+    return {
+        "wall_ms": wall * 1000,
+        "elements": elements,
+        "delta_bytes": sum(by_type.values()),
+        "bytes_by_type": dict(by_type),
+        "media_bytes": media.bytes,
+        "error": error,
+    }
+
+
+def peak_memory(script):
+    tracemalloc.start()
+    try:
+        AppTest.from_file(script, default_timeout=300).run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_page(script, runs, memory=True):
+    samples = [run_once(script) for _ in range(runs)]
+    first, steady = samples[0], samples[1:] or samples
+    walls = sorted(s["wall_ms"] for s in steady)
+    last = samples[-1]
+    return {
+        "script": script,
+        "runs": runs,
+        "cold_wall_ms": first["wall_ms"],
+        "wall_ms_median": statistics.median(walls),
+        "wall_ms_p95": walls[min(len(walls) - 1, round(0.95 * (len(walls) - 1)))],
+        "elements": last["elements"],
+        "delta_bytes": last["delta_bytes"],
+        "bytes_by_type": last["bytes_by_type"],
+        "media_bytes": last["media_bytes"],
+        "peak_memory_bytes": peak_memory(script) if memory else None,
+        "error": last["error"],
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=ROOT_DIR, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results):
+    print(f"{'page':<9}{'cold ms':>10}{'median ms':>11}{'p95 ms':>9}{'elements':>10}"
+          f"{'delta B':>11}{'media B':>12}{'peak mem':>12}")
+    for name, r in results.items():
+        peak = f"{r['peak_memory_bytes']:,}" if r["peak_memory_bytes"] is not None else "-"
+        print(f"{name:<9}{r['cold_wall_ms']:>10.1f}{r['wall_ms_median']:>11.1f}{r['wall_ms_p95']:>9.1f}"
+              f"{r['elements']:>10}{r['delta_bytes']:>11,}{r['media_bytes']:>12,}{peak:>12}")
+        if r["error"]:
+            print(f"{'':<9}raised: {r['error']}")
+
+
+def compare(results, baseline, threshold, time_threshold):
+    """Print per-metric changes; returns the list of regressions."""
+    regressions = []
+    for name, r in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        for metric in COMPARED:
+            old, new = before.get(metric), r.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            flag = ""
+            if change > (time_threshold if metric.startswith("wall_") else threshold):
+                flag = "  REGRESSION"
+                regressions.append((name, metric, old, new))
+            print(f"{name:<9}{metric:<16}{old:>14,.1f} -> {new:>14,.1f}  {change:+7.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=10, help="sessions per page (default: %(default)s)")
+    parser.add_argument("--pages", default=",".join(PAGES), help="comma-separated subset of: %(default)s")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/pages-<timestamp>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.05,
+                        help="allowed relative growth of bytes/elements (default: %(default)s)")
+    parser.add_argument("--time-threshold", type=float, default=0.25,
+                        help="allowed relative growth of median wall time (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    names = [name for name in args.pages.split(",") if name]
+    unknown = set(names) - set(PAGES)
+    if unknown:
+        parser.error(f"unknown pages: {', '.join(sorted(unknown))}")
+
+    results = {name: bench_page(PAGES[name], args.runs, memory=not args.no_memory) for name in names}
+    print_table(results)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"pages-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"revision": git_revision(), "created": time.time(), "pages": results}, f, indent=2)
+    print(f"results written to {os.path.relpath(output)}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["pages"]
+        print()
+        regressions = compare(results, baseline, args.threshold, args.time_threshold)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
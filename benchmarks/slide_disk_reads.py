@@ -0,0 +1,85 @@
+"""Count slide-file reads across many simulated sessions of app.py.
+
+    python benchmarks/slide_disk_reads.py [--sessions 100] [--static-off]
+
+Each session is a fresh ``AppTest`` run (its own session state and
+``st.cache_data`` storage) in one process, like concurrent visitors on one
+worker. With the process-wide slide catalog every slide is read once in
+total; the script exits non-zero if any session after the first touches a
+slide file.
+"""
+import argparse
+import builtins
+import collections
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+SLIDE_FOLDERS = ("HomeSlides", "ServicesSlides")
+
+
+class OpenCounter:
+    """Wraps builtins.open and counts opens of files inside the slide folders."""
+
+    def __init__(self):
+        self.counts = collections.Counter()
+        self._open = builtins.open
+
+    def __enter__(self):
+        def counting_open(file, *args, **kwargs):
+            if isinstance(file, (str, bytes, os.PathLike)):
+                relpath = os.path.relpath(os.path.abspath(os.fsdecode(file)), ROOT_DIR)
+                if relpath.split(os.sep, 1)[0] in SLIDE_FOLDERS:
+                    self.counts[relpath] += 1
+            return self._open(file, *args, **kwargs)
+
+        builtins.open = counting_open
+        return self
+
+    def __exit__(self, *exc):
+        builtins.open = self._open
+
+    def total(self):
+        return sum(self.counts.values())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--static-off", action="store_true",
+                        help="disable static serving so slides go through st.image")
+    args = parser.parse_args(argv)
+
+    if args.static_off:
+        from streamlit import config
+        config.set_option("server.enableStaticServing", False)
+
+    per_session = []
+    started = time.perf_counter()
+    with OpenCounter() as counter:
+        for _ in range(args.sessions):
+            before = counter.total()
+            at = AppTest.from_file("app.py", default_timeout=60).run()
+            if at.exception:
+                print(f"app.py raised: {at.exception[0].value}")
+                return 2
+            per_session.append(counter.total() - before)
+    elapsed = time.perf_counter() - started
+
+    print(f"sessions:            {args.sessions}")
+    print(f"slide files read:    {len(counter.counts)}")
+    print(f"total slide opens:   {counter.total()}")
+    print(f"first session opens: {per_session[0]}")
+    print(f"later session opens: {sum(per_session[1:])}")
+    print(f"wall time:           {elapsed:.2f}s ({elapsed / args.sessions * 1000:.1f} ms/session)")
+    return 1 if any(per_session[1:]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
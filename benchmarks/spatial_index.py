@@ -0,0 +1,137 @@
+"""Time GridIndex box, radius and k-nearest queries against brute-force NumPy scans.
+
+    python benchmarks/spatial_index.py [--sizes 100000 1000000 10000000] [--queries 50]
+
+For each size the sample terrain (bita/viewer3d/data.py) is indexed once,
+then the same random queries, centred on random points, run through
+``GridIndex`` (bita/viewer3d/spatial.py) and through a scan of every
+point. Each query's result is checked against the scan; the script exits
+non-zero on any mismatch. Queries are local (a box and a ball about 1% of
+the extent across, the 10 nearest points), like picking or selecting
+near the cursor.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from bita.viewer3d.data import sample_cloud  # noqa: E402
+from bita.viewer3d.spatial import GridIndex  # noqa: E402
+
+DEFAULT_SIZES = (100_000, 1_000_000, 10_000_000)
+# Query size as a share of the bounding box's largest side.
+QUERY_SHARE = 0.01
+NEAREST_K = 10
+
+
+# --- Brute force ---
+def scan_box(points, lo, hi):
+    return np.flatnonzero(((points >= lo.astype(np.float32)) & (points <= hi.astype(np.float32))).all(axis=1))
+
+
+def scan_radius(points, center, radius):
+    offsets = points - center
+    return np.flatnonzero(np.einsum("ij,ij->i", offsets, offsets) <= radius * radius)
+
+
+def scan_nearest(points, center, k):
+    offsets = points - center
+    distances = np.einsum("ij,ij->i", offsets, offsets)
+    nearest = np.argpartition(distances, k - 1)[:k]
+    order = nearest[np.argsort(distances[nearest], kind="stable")]
+    return order, np.sqrt(distances[order])
+
+
+# --- Timing ---
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def run_size(size, queries, seed):
+    points = sample_cloud(size, seed=seed)
+    index, build_ms = timed(GridIndex, points)
+    rng = np.random.default_rng(seed + 1)
+    reach = float((index.hi - index.lo).max()) * QUERY_SHARE / 2
+    times = {kind: {"indexed": [], "scan": []} for kind in ("box", "radius", "nearest")}
+    matched = {"box": 0, "radius": 0}
+    mismatches = 0
+    for center in points[rng.integers(size, size=queries)].astype(np.float64):
+        lo, hi = center - reach, center + reach
+        rows, indexed_ms = timed(index.box, lo, hi)
+        expected, scan_ms = timed(scan_box, points, lo, hi)
+        mismatches += not np.array_equal(rows, expected)
+        matched["box"] += len(rows)
+        times["box"]["indexed"].append(indexed_ms)
+        times["box"]["scan"].append(scan_ms)
+
+        rows, indexed_ms = timed(index.radius, center, reach)
+        expected, scan_ms = timed(scan_radius, points, center, reach)
+        mismatches += not np.array_equal(rows, expected)
+        matched["radius"] += len(rows)
+        times["radius"]["indexed"].append(indexed_ms)
+        times["radius"]["scan"].append(scan_ms)
+
+        (_, distances), indexed_ms = timed(index.nearest, center, NEAREST_K)
+        (_, expected), scan_ms = timed(scan_nearest, points, center, NEAREST_K)
+        mismatches += not np.allclose(distances, expected)
+        times["nearest"]["indexed"].append(indexed_ms)
+        times["nearest"]["scan"].append(scan_ms)
+
+    return {
+        "points": size,
+        "build_ms": round(build_ms, 1),
+        "index_mb": round(index.nbytes / 2 ** 20, 1),
+        "cells": int(np.prod(index.shape)),
+        "mean_rows": {kind: round(total / queries, 1) for kind, total in matched.items()},
+        "median_ms": {
+            kind: {method: round(statistics.median(values), 3) for method, values in methods.items()}
+            for kind, methods in times.items()
+        },
+        "mismatches": mismatches,
+    }
+
+
+def print_result(result):
+    print(f"{result['points']:>12,} points: index built in {result['build_ms']:,.0f} ms, "
+          f"{result['index_mb']} MB, {result['cells']:,} cells")
+    for kind, medians in result["median_ms"].items():
+        speedup = medians["scan"] / medians["indexed"] if medians["indexed"] else float("inf")
+        rows = f", {result['mean_rows'][kind]:,.0f} rows" if kind in result["mean_rows"] else ""
+        print(f"    {kind:<8} indexed {medians['indexed']:>8.3f} ms   scan {medians['scan']:>9.3f} ms   "
+              f"x{speedup:,.0f}{rows}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="point counts to test")
+    parser.add_argument("--queries", type=int, default=50, help="queries of each kind per size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in args.sizes:
+        result = run_size(size, args.queries, args.seed)
+        print_result(result)
+        results.append(result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    mismatches = sum(result["mismatches"] for result in results)
+    if mismatches:
+        print(f"{mismatches} indexed result(s) differ from the scan")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
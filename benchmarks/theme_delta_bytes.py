@@ -0,0 +1,62 @@
+"""Measure the theme + navbar bytes each rerun pushes to the browser.
+
+    python benchmarks/theme_delta_bytes.py
+
+Runs app.py and pages/ourstar.py through ``AppTest`` and sums the protobuf
+size of the markdown elements that carry the theme (stylesheet link) and
+the navbar. The "inline" column is what the same content cost when every
+page inlined the unminified <style> block and the full-size logo as a
+base64 data URL.
+"""
+import base64
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from streamlit.proto.Markdown_pb2 import Markdown  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from bita import theme  # noqa: E402
+from bita.logo import LOGO_SOURCE  # noqa: E402
+from bita.tool_logos import REMOTE_LOGOS  # noqa: E402
+
+PAGES = {"home": "app.py", "ourstar": "pages/ourstar.py"}
+
+
+def markdown_bytes(body):
+    return Markdown(body=body, allow_html=True).ByteSize()
+
+
+def inline_bytes(active_page):
+    with open(theme.CSS_SOURCE, encoding="utf-8") as f:
+        css = f.read()
+    with open(LOGO_SOURCE, "rb") as f:
+        logo = "data:image/png;base64," + base64.b64encode(f.read()).decode()
+    whatsapp_icon = f'<img src="{REMOTE_LOGOS["whatsapp"]}" alt="WhatsApp" class="whatsapp-icon">'
+    return markdown_bytes(f"<style>{css}</style>") + markdown_bytes(theme.navbar_html(active_page, logo, whatsapp_icon))
+
+
+def measured_bytes(script):
+    at = AppTest.from_file(script, default_timeout=60).run()
+    if at.exception:
+        raise SystemExit(f"{script} raised: {at.exception[0].value}")
+    themed = [m for m in at.markdown if 'class="navbar"' in m.value or 'rel="stylesheet"' in m.value
+              or m.value.startswith("<style>")]
+    total = sum(m.proto.ByteSize() for m in at.markdown)
+    return sum(m.proto.ByteSize() for m in themed), total
+
+
+def main():
+    print(f"{'page':<10}{'inline':>14}{'now':>10}{'saved':>14}{'all markdown now':>20}")
+    for page, script in PAGES.items():
+        before = inline_bytes(page)
+        now, total = measured_bytes(script)
+        print(f"{page:<10}{before:>14,}{now:>10,}{before - now:>14,}{total:>20,}")
+    print(f"stylesheet {theme.CSS_RELPATH}: {len(theme.CSS):,} bytes, fetched once and cached by the browser")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""Shared helpers for the BITA Streamlit pages (assets, static serving)."""
+import os
+
+# Repository root: the folder holding app.py, the slide folders and static/.
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,313 @@
+"""Build-time slide pipeline: width-bucketed WebP/AVIF variants plus a manifest.
+
+Run from the repository root:
+
+    python -m bita.assets build            # render new or changed slides
+    python -m bita.assets build --force    # re-render everything
+    python -m bita.assets check            # exit 1 if the manifest is stale
+
+The pages import this module at runtime and use ``picture_html`` to emit a
+lazily loaded ``<picture>`` element whose ``srcset`` lets the browser pick the
+smallest variant that fits the viewport. Each manifest entry also carries a
+tiny blurred LQIP (low-quality image placeholder) shown until the slide loads.
+"""
+import argparse
+import base64
+import hashlib
+import html
+import io
+import json
+import os
+import sys
+
+from PIL import Image, ImageOps, features
+
+from bita import ROOT_DIR
+from bita.static import STATIC_DIR, static_url
+
+try:
+    # Pillow < 11.2 needs the external plugin for AVIF; newer Pillow has it built in.
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+# --- Configuration ---
+SOURCE_FOLDERS = ("HomeSlides", "ServicesSlides", "OurStar")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+WIDTHS = (480, 768, 1024, 1440, 1920)
+QUALITY = {"avif": 50, "webp": 80}
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+OUTPUT_RELDIR = "slides"
+LQIP_WIDTH = 24  # px; ~300 bytes inline, upscaled by the browser into a blur
+LQIP_QUALITY = 30
+MANIFEST_VERSION = 2
+
+OUTPUT_DIR = os.path.join(STATIC_DIR, OUTPUT_RELDIR)
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, "manifest.json")
+
+
+def available_formats():
+    """Output formats this Pillow build can encode, best compression first."""
+    formats = []
+    if ".avif" in Image.registered_extensions():
+        formats.append("avif")
+    if features.check("webp"):
+        formats.append("webp")
+    return formats
+
+
+def target_widths(source_width, widths=WIDTHS):
+    """Width buckets below the source width, plus the source width itself.
+
+    Buckets within 10% of the source width are dropped; they would cost an
+    extra file for no visible saving.
+    """
+    targets = [w for w in widths if w < source_width * 0.9]
+    targets.append(source_width)
+    return targets
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_sources(folders=SOURCE_FOLDERS):
+    """Yield repository-relative paths ("HomeSlides/1.png") of every slide image."""
+    for folder in folders:
+        folder_path = os.path.join(ROOT_DIR, folder)
+        if not os.path.isdir(folder_path):
+            continue
+        for name in sorted(os.listdir(folder_path)):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                yield f"{folder}/{name}"
+
+
+def _variant_relpath(source, width, digest, fmt):
+    folder, name = source.rsplit("/", 1)
+    stem = os.path.splitext(name)[0]
+    return f"{OUTPUT_RELDIR}/{folder}/{stem}-{width}w-{digest[:10]}.{fmt}"
+
+
+def _prepare(image):
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+    return image
+
+
+def lqip_data_url(image, width=LQIP_WIDTH):
+    """Tiny WebP data URL of ``image`` used as a blurred placeholder background."""
+    height = max(1, round(image.height * width / image.width))
+    small = image.convert("RGB").resize((width, height), Image.BILINEAR)
+    buffer = io.BytesIO()
+    small.save(buffer, format="WEBP", quality=LQIP_QUALITY)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+def render_variants(source, digest, formats, widths=WIDTHS):
+    """Encode every (width, format) variant of one source image; return manifest entry."""
+    source_path = os.path.join(ROOT_DIR, *source.split("/"))
+    with Image.open(source_path) as opened:
+        image = _prepare(opened)
+        source_width, source_height = image.size
+        variants = []
+        for width in target_widths(source_width, widths):
+            height = max(1, round(source_height * width / source_width))
+            resized = image if width == source_width else image.resize((width, height), Image.LANCZOS)
+            for fmt in formats:
+                relpath = _variant_relpath(source, width, digest, fmt)
+                out_path = os.path.join(STATIC_DIR, *relpath.split("/"))
+                os.makedirs(os.path.dirname(out_path), exist_ok=True)
+                options = {"method": 6} if fmt == "webp" else {}
+                resized.save(out_path, format=fmt.upper(), quality=QUALITY[fmt], **options)
+                variants.append({
+                    "path": relpath,
+                    "format": fmt,
+                    "width": width,
+                    "height": height,
+                    "bytes": os.path.getsize(out_path),
+                    "sha256": file_sha256(out_path),
+                })
+        lqip = lqip_data_url(image)
+    return {
+        "sha256": digest,
+        "width": source_width,
+        "height": source_height,
+        "bytes": os.path.getsize(source_path),
+        "lqip": lqip,
+        "variants": variants,
+    }
+
+
+def _entry_is_current(entry, digest, formats, widths):
+    if not entry or entry.get("sha256") != digest:
+        return False
+    built = {(v["width"], v["format"]) for v in entry["variants"]}
+    wanted = {(w, f) for w in target_widths(entry["width"], widths) for f in formats}
+    if built != wanted:
+        return False
+    return all(os.path.exists(os.path.join(STATIC_DIR, *v["path"].split("/"))) for v in entry["variants"])
+
+
+def read_manifest(path=None):
+    try:
+        with open(path or MANIFEST_PATH, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def build(force=False, widths=WIDTHS, log=print):
+    """Render missing/stale variants, prune orphans and rewrite the manifest."""
+    formats = available_formats()
+    if not formats:
+        raise RuntimeError("This Pillow build cannot encode WebP or AVIF.")
+
+    previous = (read_manifest() or {}).get("images", {})
+    images = {}
+    for source in iter_sources():
+        digest = file_sha256(os.path.join(ROOT_DIR, *source.split("/")))
+        entry = previous.get(source)
+        if not force and _entry_is_current(entry, digest, formats, widths):
+            images[source] = entry
+            continue
+        images[source] = render_variants(source, digest, formats, widths)
+        saved = images[source]["bytes"] - min(v["bytes"] for v in images[source]["variants"])
+        log(f"built {source}: {len(images[source]['variants'])} variants, smallest saves {saved:,} bytes")
+
+    # Drop variant files no longer referenced (old hashes, removed slides).
+    keep = {v["path"] for entry in images.values() for v in entry["variants"]}
+    if os.path.isdir(OUTPUT_DIR):
+        for dirpath, _, filenames in os.walk(OUTPUT_DIR):
+            for name in filenames:
+                relpath = os.path.relpath(os.path.join(dirpath, name), STATIC_DIR).replace(os.sep, "/")
+                if name != os.path.basename(MANIFEST_PATH) and relpath not in keep:
+                    os.remove(os.path.join(dirpath, name))
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "formats": formats,
+        "widths": list(widths),
+        "images": images,
+    }
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+    return manifest
+
+
+def check(widths=None):
+    """Return the list of sources whose variants are missing or out of date.
+
+    ``widths`` defaults to the buckets the manifest was built with, so a
+    ``build --widths ...`` is not reported stale by a plain ``check``.
+    """
+    formats = available_formats()
+    manifest = read_manifest() or {}
+    widths = widths or manifest.get("widths") or WIDTHS
+    images = manifest.get("images", {})
+    stale = []
+    for source in iter_sources():
+        digest = file_sha256(os.path.join(ROOT_DIR, *source.split("/")))
+        if not _entry_is_current(images.get(source), digest, formats, widths):
+            stale.append(source)
+    return stale
+
+
+# --- Runtime lookups (used by the pages) ---
+_manifest_cache = {"mtime": None, "manifest": None}
+
+
+def load_manifest():
+    """The manifest, re-read only when the file on disk changes."""
+    try:
+        mtime = os.stat(MANIFEST_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if _manifest_cache["mtime"] != mtime:
+        _manifest_cache["manifest"] = read_manifest()
+        _manifest_cache["mtime"] = mtime
+    return _manifest_cache["manifest"]
+
+
+def _source_key(path):
+    relpath = os.path.relpath(os.path.abspath(path), ROOT_DIR)
+    return relpath.replace(os.sep, "/")
+
+
+def variants_for(path):
+    """Manifest entry for a slide path, or None when it has not been built."""
+    manifest = load_manifest()
+    if not manifest:
+        return None
+    return manifest["images"].get(_source_key(path))
+
+
+def picture_html(path, alt="", sizes="100vw", lazy=True):
+    """``<picture>`` markup serving the best format and smallest fitting width.
+
+    With ``lazy`` the browser defers the download until the slide nears the
+    viewport and shows the LQIP meanwhile; the width/height attributes
+    reserve the slide's box so nothing shifts when it arrives. Returns None
+    when the slide has no built variants, so callers can fall back to
+    ``st.image``.
+    """
+    entry = variants_for(path)
+    if not entry or not entry["variants"]:
+        return None
+    by_format = {}
+    for variant in entry["variants"]:
+        by_format.setdefault(variant["format"], []).append(variant)
+    sources = []
+    for fmt, variants in by_format.items():
+        srcset = ", ".join(f'{static_url(v["path"])} {v["width"]}w' for v in sorted(variants, key=lambda v: v["width"]))
+        sources.append(f'<source type="{MIME_TYPES[fmt]}" srcset="{srcset}" sizes="{sizes}">')
+    fallback = max(by_format.get("webp") or entry["variants"], key=lambda v: v["width"])
+    loading = ' loading="lazy"' if lazy else ""
+    placeholder = ""
+    if lazy and entry.get("lqip"):
+        placeholder = f' style="background: url({entry["lqip"]}) center / contain no-repeat;"'
+    return (
+        "<picture>" + "".join(sources)
+        + f'<img src="{static_url(fallback["path"])}" alt="{html.escape(alt)}" '
+        f'width="{entry["width"]}" height="{entry["height"]}" decoding="async"{loading}{placeholder}>'
+        + "</picture>"
+    )
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bita.assets", description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_cmd = sub.add_parser("build", help="render responsive slide variants and write the manifest")
+    build_cmd.add_argument("--force", action="store_true", help="re-render even if the manifest is current")
+    build_cmd.add_argument("--widths", type=lambda s: tuple(int(w) for w in s.split(",")), default=WIDTHS,
+                           help="comma-separated width buckets (default: %(default)s)")
+    sub.add_parser("check", help="exit non-zero when variants are missing or stale")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        manifest = build(force=args.force, widths=args.widths)
+        total_source = sum(e["bytes"] for e in manifest["images"].values())
+        total_variants = sum(v["bytes"] for e in manifest["images"].values() for v in e["variants"])
+        print(f"{len(manifest['images'])} slides, formats {', '.join(manifest['formats'])}; "
+              f"{total_source:,} source bytes -> {total_variants:,} bytes across all variants")
+        return 0
+
+    stale = check()
+    for source in stale:
+        print(f"stale: {source}")
+    return 1 if stale else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
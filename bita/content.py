@@ -0,0 +1,135 @@
+"""Declarative page content: content/home.json, loaded once and versioned by its hash.
+
+The file describes the home page (page title, hero, service cards, slide
+decks, contact details) as plain text and paths. ``get_content()`` returns
+the current ``Content``; the file is re-stat'ed at most every
+REFRESH_SECONDS and re-parsed only when its mtime or size changes, so
+content edits go live without a redeploy. Set BITA_CONTENT to load the
+file from somewhere else.
+
+An edit that fails validation is reported in ``Content.error`` while the
+last good version keeps serving; only a bad first load raises.
+"""
+import collections
+import hashlib
+import json
+import os
+import threading
+import time
+
+from bita import ROOT_DIR
+from bita.tool_logos import REMOTE_LOGOS
+
+CONTENT_PATH = os.path.join(ROOT_DIR, "content", "home.json")
+SCHEMA = 1
+REFRESH_SECONDS = 5.0
+
+# Required keys per section; every value listed here is a string unless noted below.
+REQUIRED = {
+    "page": ("title", "icon"),
+    "hero": ("lead", "primary", "middle", "secondary", "tail"),
+    "services": ("anchor", "title", "cards"),
+    "decks": ("services", "about"),
+    "contact": ("anchor", "title", "intro", "email", "phone", "phone_label", "address", "copyright"),
+}
+CARD_KEYS = ("logo", "title", "text")
+DECK_KEYS = ("anchor", "slides")
+
+Content = collections.namedtuple("Content", "data version path error")
+Content.__doc__ = """Parsed content ``data``, its ``version`` (content hash) and the last reload ``error``, if any."""
+
+
+class ContentError(ValueError):
+    """The content file is missing, not JSON, or does not match the schema."""
+
+
+def _require(mapping, keys, where):
+    if not isinstance(mapping, dict):
+        raise ContentError(f"{where}: expected an object")
+    missing = [key for key in keys if key not in mapping]
+    if missing:
+        raise ContentError(f"{where}: missing {', '.join(missing)}")
+
+
+def validate(data):
+    """Raise ContentError unless ``data`` matches the content schema."""
+    _require(data, ("schema",) + tuple(REQUIRED), "content")
+    if data["schema"] != SCHEMA:
+        raise ContentError(f"content: schema {data['schema']!r} is not supported (expected {SCHEMA})")
+    for section, keys in REQUIRED.items():
+        _require(data[section], keys, section)
+    cards = data["services"]["cards"]
+    if not isinstance(cards, list) or not cards:
+        raise ContentError("services.cards: expected a non-empty list")
+    for index, card in enumerate(cards):
+        _require(card, CARD_KEYS, f"services.cards[{index}]")
+        if card["logo"] not in REMOTE_LOGOS:
+            raise ContentError(
+                f"services.cards[{index}].logo: unknown logo {card['logo']!r} "
+                f"(expected one of {', '.join(sorted(REMOTE_LOGOS))})"
+            )
+    for name, deck in data["decks"].items():
+        _require(deck, DECK_KEYS, f"decks.{name}")
+        if not isinstance(deck["slides"], list):
+            raise ContentError(f"decks.{name}.slides: expected a list of paths")
+
+
+def load_content(path=CONTENT_PATH):
+    """Read, parse and validate the content file."""
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+        data = json.loads(raw)
+    except (OSError, ValueError) as e:
+        raise ContentError(f"{path}: {e}") from e
+    validate(data)
+    return Content(data, hashlib.sha256(raw).hexdigest()[:10], path, None)
+
+
+class ContentStore:
+    """Process-wide content, reloaded when the file's mtime or size changes."""
+
+    def __init__(self, path=CONTENT_PATH, refresh_seconds=REFRESH_SECONDS):
+        self.path = path
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._content = None
+        self._signature = None
+        self._checked_at = None
+
+    def get(self):
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.refresh_seconds:
+            return self._content
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.refresh_seconds:
+                return self._content
+            try:
+                stat = os.stat(self.path)
+                signature = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                signature = None
+            if self._content is None or signature != self._signature:
+                try:
+                    self._content = load_content(self.path)
+                except ContentError as e:
+                    if self._content is None:
+                        raise
+                    self._content = self._content._replace(error=str(e))
+                self._signature = signature
+            self._checked_at = now
+            return self._content
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_content(path=None):
+    """The current content for ``path`` (default: $BITA_CONTENT or content/home.json)."""
+    path = path or os.environ.get("BITA_CONTENT") or CONTENT_PATH
+    store = _stores.get(path)
+    if store is None:
+        with _stores_lock:
+            store = _stores.setdefault(path, ContentStore(path))
+    return store.get()
@@ -0,0 +1,118 @@
+"""Process-wide base64 encoding cache for files inlined into pages.
+
+Replaces the per-page ``get_base64`` helpers. Entries are keyed on
+(path, mtime, size), kept in LRU order under a byte budget, and shared by
+every session on the worker, so concurrent reruns reuse one encoded string
+instead of each holding their own copy. Files are read through ``mmap`` so
+large assets are not copied into Python memory before encoding.
+
+The budget defaults to 32 MB and can be set with BITA_BASE64_CACHE_BYTES.
+"""
+import base64
+import collections
+import mimetypes
+import mmap
+import os
+import threading
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+mimetypes.add_type("image/webp", ".webp")
+
+
+def _read_base64(path, size):
+    if size == 0:
+        return ""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return base64.b64encode(mapped).decode("ascii")
+
+
+class EncodingCache:
+    """LRU cache of base64 strings bounded by their total size in bytes."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = collections.OrderedDict()  # key -> encoded str
+        self._size = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_base64(self, path):
+        """Base64 of the file at ``path``; raises FileNotFoundError like ``open`` would."""
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            encoded = self._lookup(key)
+            if encoded is not None:
+                return encoded
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # One encode per key: concurrent misses wait for the first instead of
+        # each building its own multi-megabyte string.
+        with key_lock:
+            try:
+                with self._lock:
+                    encoded = self._lookup(key)
+                    if encoded is not None:
+                        return encoded
+                    self.misses += 1
+                encoded = _read_base64(key[0], stat.st_size)
+                with self._lock:
+                    self._store(key, encoded)
+            finally:
+                # Even when the read fails (file replaced or unreadable); otherwise the locks pile up.
+                with self._lock:
+                    self._key_locks.pop(key, None)
+        return encoded
+
+    def data_url(self, path, mime=None):
+        """``data:`` URL for ``path``, guessing the MIME type from its extension."""
+        mime = mime or mimetypes.guess_type(path)[0] or "application/octet-stream"
+        return f"data:{mime};base64,{self.get_base64(path)}"
+
+    def _lookup(self, key):
+        encoded = self._entries.get(key)
+        if encoded is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return encoded
+
+    def _store(self, key, encoded):
+        if len(encoded) > self.max_bytes:
+            return  # larger than the whole budget: serve it, don't keep it
+        # Drop stale versions of the same file before inserting the new one.
+        for old_key in [k for k in self._entries if k[0] == key[0]]:
+            self._size -= len(self._entries.pop(old_key))
+        self._entries[key] = encoded
+        self._size += len(encoded)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+_cache = EncodingCache(int(os.environ.get("BITA_BASE64_CACHE_BYTES", DEFAULT_MAX_BYTES)))
+
+get_base64 = _cache.get_base64
+data_url = _cache.data_url
+stats = _cache.stats
+clear = _cache.clear
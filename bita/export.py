@@ -0,0 +1,159 @@
+"""Static export of the home page: plain HTML, one fingerprinted stylesheet and the built images.
+
+    python -m bita.export                                     # write dist/
+    python -m bita.export --out site --app-url https://app.example.com
+
+The home page is static content (hero, service cards, slides, contact
+footer) that Streamlit otherwise re-renders with a full Python run per
+visitor. The export renders the same fragments (content/home.json via
+bita/sections.py) into ``<out>/index.html`` and copies every file it links
+from static/ into ``<out>/static/`` under its fingerprinted name, so any
+CDN or static host can serve it with long-lived caching and no Python.
+
+Interactive parts stay in Streamlit: with ``--app-url`` the AI insight
+generator becomes a link into the live app, and so does "Our Stars";
+without it both are left out, since neither page is exported. The Static Web Apps workflow
+still deploys the hand-written index.html; point its ``app_location`` at
+the export directory to publish this bundle instead.
+"""
+import argparse
+import html
+import os
+import re
+import shutil
+import sys
+
+from bita import assets
+from bita.sections import get_home
+from bita.static import STATIC_DIR, exporting, static_path, static_url
+
+EXPORT_CSS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "theme", "export.css")
+DEFAULT_OUT = "dist"
+URL_PREFIX = "static/"
+# Every file under static/ the exported pages link to, in attributes, srcsets or inline CSS.
+STATIC_REF_RE = re.compile(r"""(?<![\w/.])static/([^\s"'()<>,?#]+)""")
+
+
+# --- Sections ---
+def slideshow_html(deck, log=print):
+    """The markup ``render_slideshow`` emits when every slide has built variants."""
+    parts = [f'<div id="{deck.anchor}"></div>']
+    for path in deck.slides:
+        picture = assets.picture_html(path)
+        if picture is None:
+            log(f"skipped {path}: no built variants")
+            continue
+        parts.append(f'<div class="stretched-image-container">{picture}</div><br>')
+    return "".join(parts)
+
+
+def insights_html(app_url):
+    """A link into the live app in place of the (interactive) insight generator."""
+    from bita.insights.ui import INTRO
+
+    return (
+        '<div id="insights"></div>'
+        '<h2 class="contact-header">✨ AI Insight Generator</h2>'
+        f'<p style="color: #9ca3af; margin-bottom: 1.5rem; max-width: 48rem;">{INTRO}</p>'
+        f'<a class="app-cta" href="{html.escape(app_url)}#insights">Generate Expert Insight ✨</a>'
+    )
+
+
+def home_html(app_url="", log=print):
+    """The complete exported home page. Call inside ``exporting`` so static files are linked relatively."""
+    from bita.logo import logo_src
+    from bita.theme import CSS_SOURCE, build_stylesheet, navbar_html
+    from bita.tool_logos import logo_html
+
+    _, css_relpath = build_stylesheet((CSS_SOURCE, EXPORT_CSS), name="site")
+    whatsapp_icon = logo_html("whatsapp", 25, alt="WhatsApp", css_class="whatsapp-icon")
+    home = get_home()
+    body = [
+        home.blocks["intro"].html,
+        insights_html(app_url) if app_url else "",
+        slideshow_html(home.decks["services"], log),
+        slideshow_html(home.decks["about"], log),
+        home.blocks["contact"].html,
+        "<hr>",
+    ]
+    return (
+        '<!DOCTYPE html>\n<html lang="en">\n<head>\n'
+        '<meta charset="utf-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+        f"<title>{html.escape(home.title)}</title>\n"
+        f'<link rel="icon" href="{html.escape(home.icon)}">\n'
+        f'<link rel="stylesheet" href="{static_url(css_relpath)}">\n'
+        "</head>\n<body>\n"
+        '<div class="stApp">\n'
+        + navbar_html("home", logo_src(), whatsapp_icon, app_url, page_links=bool(app_url))
+        + '\n<main class="export-main">\n'
+        + "\n".join(part for part in body if part)
+        + "\n</main>\n</div>\n</body>\n</html>\n"
+    )
+
+
+# --- Bundle ---
+def referenced_files(text):
+    """Relative paths under static/ that ``text`` links to."""
+    return sorted(set(STATIC_REF_RE.findall(text)))
+
+
+def copy_static(relpaths, out_dir):
+    """Copy ``relpaths`` into <out_dir>/static/ and drop files no longer linked; returns bytes copied."""
+    target_dir = os.path.join(out_dir, "static")
+    total = 0
+    for relpath in relpaths:
+        source = static_path(relpath)
+        target = os.path.join(target_dir, *relpath.split("/"))
+        total += os.path.getsize(source)
+        if os.path.exists(target) and os.path.getsize(target) == os.path.getsize(source):
+            continue  # fingerprinted names: same name and size means same file
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(source, target)
+    keep = {os.path.join(target_dir, *relpath.split("/")) for relpath in relpaths}
+    for dirpath, _, filenames in os.walk(target_dir):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if path not in keep:
+                os.remove(path)
+    return total
+
+
+def export(out_dir=DEFAULT_OUT, app_url="", log=print):
+    """Build missing assets, then write the static site to ``out_dir``; returns a summary."""
+    assets.build(log=log)
+    with exporting(URL_PREFIX):
+        page = home_html(app_url, log)
+    relpaths = referenced_files(page)
+    css = [relpath for relpath in relpaths if relpath.endswith(".css")]
+    for relpath in css:
+        with open(static_path(relpath), encoding="utf-8") as f:
+            relpaths = sorted(set(relpaths) | set(referenced_files(f.read())))
+    missing = [relpath for relpath in relpaths if not os.path.exists(static_path(relpath))]
+    if missing:
+        raise FileNotFoundError(f"linked but not built under {STATIC_DIR}: {', '.join(missing)}")
+
+    os.makedirs(out_dir, exist_ok=True)
+    static_bytes = copy_static(relpaths, out_dir)
+    tmp_path = os.path.join(out_dir, "index.html.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(page)
+    os.replace(tmp_path, os.path.join(out_dir, "index.html"))
+    return {"html_bytes": len(page.encode()), "files": len(relpaths), "static_bytes": static_bytes}
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bita.export", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--out", default=DEFAULT_OUT, help="output directory (default: %(default)s)")
+    parser.add_argument("--app-url", default="", help="live Streamlit app for the interactive sections")
+    args = parser.parse_args(argv)
+
+    summary = export(args.out, args.app_url)
+    print(f"{os.path.join(args.out, 'index.html')}: {summary['html_bytes']:,} bytes; "
+          f"{summary['files']} static files, {summary['static_bytes']:,} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
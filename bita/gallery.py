@@ -0,0 +1,270 @@
+"""Indexed OurStar gallery: one folder scan per change instead of per rerun.
+
+The index records, for each image, its display size (after EXIF
+orientation), byte size, content hash, EXIF orientation and a WebP
+thumbnail under ``static/gallery/``. It is kept in ``static/gallery/index.json``
+so a restarted worker only re-hashes files whose mtime or size changed.
+
+Pages read the in-memory index. It is refreshed either lazily (a
+``os.scandir`` at most every ``REFRESH_SECONDS``) or, with
+BITA_GALLERY_WATCH=<seconds>, by a background watcher thread so reruns never
+touch the folder at all.
+
+Large galleries render as a paginated thumbnail grid (``grid_html``), so a
+page only ships one page of thumbnails.
+
+    python -m bita.gallery build    # pre-build the index and thumbnails
+"""
+import argparse
+import collections
+import html
+import json
+import os
+import sys
+import threading
+import time
+from urllib.parse import quote
+
+import streamlit as st
+from PIL import Image, ImageOps
+
+from bita import ROOT_DIR, encoding
+from bita.assets import IMAGE_EXTENSIONS, file_sha256
+from bita.static import STATIC_DIR, static_path, static_serving_enabled, static_url
+
+# --- Configuration ---
+GALLERY_FOLDER = os.path.join(ROOT_DIR, "OurStar")
+OUTPUT_RELDIR = "gallery"
+INDEX_PATH = os.path.join(STATIC_DIR, OUTPUT_RELDIR, "index.json")
+INDEX_VERSION = 1
+THUMB_WIDTH = 480
+THUMB_QUALITY = 75
+REFRESH_SECONDS = 5.0
+EXIF_ORIENTATION = 0x0112
+
+GalleryImage = collections.namedtuple(
+    "GalleryImage", "name path width height bytes sha256 orientation thumbnail"
+)
+GalleryImage.__doc__ = """One indexed image; ``path`` is absolute, ``thumbnail`` is relative to static/."""
+
+
+def _thumbnail_relpath(name, digest):
+    stem = os.path.splitext(name)[0]
+    return f"{OUTPUT_RELDIR}/thumbs/{stem}-{digest[:10]}.webp"
+
+
+def describe(path, name, stat):
+    """Index entry for one image file; decodes it once to read size, orientation and the thumbnail."""
+    digest = file_sha256(path)
+    thumbnail = _thumbnail_relpath(name, digest)
+    with Image.open(path) as image:
+        orientation = image.getexif().get(EXIF_ORIENTATION, 1)
+        image = ImageOps.exif_transpose(image)
+        width, height = image.size
+        thumb_path = os.path.join(STATIC_DIR, *thumbnail.split("/"))
+        if not os.path.exists(thumb_path):
+            os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
+            thumb = image.convert("RGB")
+            if width > THUMB_WIDTH:
+                thumb = thumb.resize((THUMB_WIDTH, max(1, round(height * THUMB_WIDTH / width))), Image.LANCZOS)
+            thumb.save(thumb_path, format="WEBP", quality=THUMB_QUALITY, method=6)
+    return {
+        "mtime_ns": stat.st_mtime_ns,
+        "bytes": stat.st_size,
+        "sha256": digest,
+        "width": width,
+        "height": height,
+        "orientation": orientation,
+        "thumbnail": thumbnail,
+    }
+
+
+def read_index(path=INDEX_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            index = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if index.get("version") != INDEX_VERSION:
+        return {}
+    return index.get("images", {})
+
+
+def write_index(images, path=INDEX_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": INDEX_VERSION, "images": images}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+class GalleryIndex:
+    """Process-wide index of one image folder, refreshed incrementally by mtime/size."""
+
+    def __init__(self, folder=GALLERY_FOLDER, index_path=INDEX_PATH, refresh_seconds=REFRESH_SECONDS):
+        self.folder = folder
+        self.index_path = index_path
+        self.refresh_seconds = refresh_seconds
+        self.missing = False
+        self._entries = read_index(index_path)
+        self._images = ()
+        self._checked_at = None
+        self._lock = threading.Lock()
+        self._watcher = None
+
+    def refresh(self):
+        """Re-scan the folder; only new or changed files are hashed and decoded. Returns True on change."""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                scanned = sorted(
+                    (e for e in os.scandir(self.folder) if e.name.lower().endswith(IMAGE_EXTENSIONS) and e.is_file()),
+                    key=lambda e: e.name,
+                )
+            except FileNotFoundError:
+                self.missing, self._images = True, ()
+                return False
+            self.missing = False
+
+            entries, changed = {}, False
+            for dir_entry in scanned:
+                stat = dir_entry.stat()
+                entry = self._entries.get(dir_entry.name)
+                thumb_exists = entry and os.path.exists(os.path.join(STATIC_DIR, *entry["thumbnail"].split("/")))
+                if not (entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["bytes"] == stat.st_size
+                        and thumb_exists):
+                    try:
+                        entry = describe(dir_entry.path, dir_entry.name, stat)
+                    except (OSError, SyntaxError):
+                        continue  # unreadable or not really an image
+                    changed = True
+                entries[dir_entry.name] = entry
+            changed = changed or entries.keys() != self._entries.keys()
+
+            self._entries = entries
+            self._images = tuple(
+                GalleryImage(name, os.path.join(self.folder, name), e["width"], e["height"], e["bytes"],
+                             e["sha256"], e["orientation"], e["thumbnail"])
+                for name, e in entries.items()
+            )
+            if changed:
+                self._prune_thumbnails()
+                try:
+                    write_index(entries, self.index_path)
+                except OSError:
+                    pass  # read-only deploy: keep the index in memory only
+            return changed
+
+    def _prune_thumbnails(self):
+        thumb_dir = os.path.join(os.path.dirname(self.index_path), "thumbs")
+        keep = {os.path.basename(e["thumbnail"]) for e in self._entries.values()}
+        try:
+            names = os.listdir(thumb_dir)
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name not in keep:
+                try:
+                    os.remove(os.path.join(thumb_dir, name))
+                except OSError:
+                    pass
+
+    def images(self):
+        """Indexed images sorted by file name; re-scans only if the watcher is off and the index is old."""
+        watching = self._watcher is not None and self._watcher.is_alive()
+        if self._checked_at is None or (
+            not watching and time.monotonic() - self._checked_at >= self.refresh_seconds
+        ):
+            self.refresh()
+        return self._images
+
+    # --- Watcher ---
+    def watch(self, interval):
+        """Start a daemon thread that refreshes the index every ``interval`` seconds."""
+        if self._watcher is not None and self._watcher.is_alive():
+            return self._watcher
+
+        def loop():
+            while True:
+                try:
+                    self.refresh()
+                except Exception:
+                    pass  # a transient error must not kill the watcher
+                time.sleep(interval)
+
+        self.refresh()
+        self._watcher = threading.Thread(target=loop, name="gallery-watcher", daemon=True)
+        self._watcher.start()
+        return self._watcher
+
+
+# --- Paginated grid ---
+PAGE_SIZE = 12
+
+
+def paginate(items, page, page_size=PAGE_SIZE):
+    """``(items on page, page, page count)`` with ``page`` clamped to 1..count."""
+    pages = max(1, -(-len(items) // page_size))
+    page = min(max(page, 1), pages)
+    start = (page - 1) * page_size
+    return items[start:start + page_size], page, pages
+
+
+def page_for(items, name, page_size=PAGE_SIZE):
+    """1-based page holding the image called ``name``, or None."""
+    for index, image in enumerate(items):
+        if image.name == name:
+            return index // page_size + 1
+    return None
+
+
+def _href(**params):
+    return "?" + "&amp;".join(f"{key}={quote(str(value))}" for key, value in params.items())
+
+
+def _thumbnail_src(image):
+    if static_serving_enabled():
+        return static_url(image.thumbnail)
+    return encoding.data_url(static_path(image.thumbnail), "image/webp")
+
+
+def grid_html(images, page):
+    """Thumbnail grid for one page; each tile deep-links to ``?page=&star=``."""
+    tiles = "".join(
+        f'<a class="star-tile" href="{_href(page=page, star=image.name)}" target="_self">'
+        f'<img src="{_thumbnail_src(image)}" alt="{html.escape(image.name)}" '
+        f'width="{THUMB_WIDTH}" height="{max(1, round(image.height * THUMB_WIDTH / image.width))}" '
+        f'loading="lazy" decoding="async"></a>'
+        for image in images
+    )
+    return f'<div class="stretched-image-container"><div class="star-grid">{tiles}</div></div>'
+
+
+@st.cache_resource(show_spinner=False)
+def get_gallery():
+    gallery = GalleryIndex()
+    interval = float(os.environ.get("BITA_GALLERY_WATCH") or 0)
+    if interval > 0:
+        gallery.watch(interval)
+    return gallery
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bita.gallery", description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="index the gallery folder and render thumbnails")
+    parser.parse_args(argv)
+
+    gallery = GalleryIndex()
+    gallery.refresh()
+    if gallery.missing:
+        print(f"no gallery folder at {gallery.folder}")
+        return 1
+    images = gallery.images()
+    print(f"{len(images)} gallery images, {sum(i.bytes for i in images):,} bytes; index at {gallery.index_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
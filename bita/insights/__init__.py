@@ -0,0 +1,26 @@
+"""Server-side AI Insight Generator, ported from ``generateInsight`` in index.html.
+
+    client = get_client()
+    stream = client.stream_insight("serverless computing in FinTech")
+    st.write_stream(stream)   # tokens render as they arrive
+    stream.sources            # grounding sources, once the stream is done
+
+The backend is pluggable: ``GeminiBackend`` talks to the Gemini API (or to
+any compatible server set with BITA_INSIGHTS_BASE_URL, such as the local
+stub in ``bita.insights.stub_server``); tests and tools may pass any object
+with a ``stream(topic)`` method.
+
+Answers are cached (``bita.insights.cache``) by normalized topic, prompt and
+model, so repeated or concurrent requests for one topic make one API call,
+and the calls that remain pass through a process-wide rate limiter
+(``bita.insights.limiter``).
+"""
+from bita.insights.backends import GeminiBackend, InsightError
+from bita.insights.cache import InsightCache
+from bita.insights.client import InsightClient, InsightStream, get_client
+from bita.insights.limiter import OutboundGate, get_gate
+
+__all__ = [
+    "GeminiBackend", "InsightCache", "InsightClient", "InsightError", "InsightStream",
+    "OutboundGate", "get_client", "get_gate",
+]
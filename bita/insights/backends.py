@@ -0,0 +1,143 @@
+"""Model backends for the insight generator.
+
+A backend has ``stream(topic)``, a generator of ``("text", str)`` and
+``("sources", [{"uri", "title"}, ...])`` events. It raises ``RetryableError``
+for failures worth retrying (429, 5xx, connection errors) before the first
+event, and ``InsightError`` for everything else.
+"""
+import json
+
+import requests
+
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com"
+MODEL_NAME = "gemini-2.5-flash-preview-09-2025"
+
+# Same prompt and settings as index.html.
+SYSTEM_PROMPT = (
+    "You are a Chief Technology Officer (CTO) and AI Strategist for a high-end consulting firm. "
+    "Your task is to provide a concise, single-paragraph expert analysis (max 150 words) on the "
+    "user's topic. Your response must be highly professional, strategic, and grounded in current, "
+    "real-time industry trends."
+)
+GENERATION_CONFIG = {
+    "temperature": 0.5,
+    "maxOutputTokens": 300,  # slightly more than the target 150 words
+}
+
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 60
+
+
+class InsightError(Exception):
+    """Generation failed; the message is safe to show to the visitor."""
+
+
+class RetryableError(InsightError):
+    """A transient failure (rate limit, server error, network) worth retrying."""
+
+    def __init__(self, message, retry_after=None, rate_limited=False):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.rate_limited = rate_limited
+
+
+def build_payload(topic, system_prompt=SYSTEM_PROMPT, generation_config=GENERATION_CONFIG):
+    user_query = f'Provide an expert analysis for a technology blog post on the following topic: "{topic}".'
+    return {
+        "contents": [{"parts": [{"text": user_query}]}],
+        # Google Search grounding for up-to-date insights.
+        "tools": [{"google_search": {}}],
+        "systemInstruction": {"parts": [{"text": system_prompt}]},
+        "generationConfig": dict(generation_config),
+    }
+
+
+def extract_sources(candidate):
+    """Grounding sources from a candidate, for both the old and new metadata shapes."""
+    metadata = candidate.get("groundingMetadata") or {}
+    entries = metadata.get("groundingChunks") or metadata.get("groundingAttributions") or []
+    sources = []
+    for entry in entries:
+        web = entry.get("web") or {}
+        if web.get("uri") and web.get("title"):
+            sources.append({"uri": web["uri"], "title": web["title"]})
+    return sources
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+class GeminiBackend:
+    """Gemini ``streamGenerateContent`` over server-sent events on a shared ``requests.Session``."""
+
+    def __init__(self, api_key, session, base_url=DEFAULT_BASE_URL, model=MODEL_NAME,
+                 system_prompt=SYSTEM_PROMPT, generation_config=GENERATION_CONFIG):
+        self.api_key = api_key
+        self.session = session
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.system_prompt = system_prompt
+        self.generation_config = generation_config
+
+    @property
+    def url(self):
+        return f"{self.base_url}/v1beta/models/{self.model}:streamGenerateContent"
+
+    def stream(self, topic):
+        payload = build_payload(topic, self.system_prompt, self.generation_config)
+        try:
+            response = self.session.post(
+                self.url,
+                params={"alt": "sse", "key": self.api_key},
+                json=payload,
+                stream=True,
+                timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+            )
+        except requests.RequestException as e:
+            raise RetryableError(f"Could not reach the model API ({e.__class__.__name__})") from e
+
+        with response:
+            if response.status_code == 429 or response.status_code >= 500:
+                raise RetryableError(
+                    f"Model API returned HTTP {response.status_code}",
+                    _retry_after(response),
+                    rate_limited=response.status_code == 429,
+                )
+            if response.status_code != 200:
+                try:
+                    message = response.json()["error"]["message"]
+                except (ValueError, KeyError, TypeError):
+                    message = f"HTTP {response.status_code}"
+                raise InsightError(message)
+
+            sources = []
+            produced = False
+            try:
+                # Decode ourselves: SSE is UTF-8, but requests assumes ISO-8859-1 for text/* without a charset.
+                for raw in response.iter_lines():
+                    line = raw.decode("utf-8", errors="replace")
+                    if not line.startswith("data:"):
+                        continue
+                    try:
+                        chunk = json.loads(line[len("data:"):])
+                    except ValueError as e:
+                        raise InsightError("Received an unexpected response from the API.") from e
+                    if "error" in chunk:
+                        raise InsightError(chunk["error"].get("message", "Generation failed."))
+                    for candidate in chunk.get("candidates", [])[:1]:
+                        for part in (candidate.get("content") or {}).get("parts", []):
+                            if part.get("text"):
+                                produced = True
+                                yield ("text", part["text"])
+                        sources = extract_sources(candidate) or sources
+            except requests.RequestException as e:
+                # Text already shown cannot be taken back, so only retry a silent failure.
+                error = InsightError if produced else RetryableError
+                raise error(f"The model API connection failed ({e.__class__.__name__})") from e
+            if not produced:
+                raise InsightError("Generation failed: Received an unexpected response from the API.")
+            yield ("sources", sources)
@@ -0,0 +1,246 @@
+"""Response cache for generated insights.
+
+Keys combine the normalized topic with the system prompt, model and
+generation config, so "Edge AI", " edge  ai " and "Edge AI?" share one
+entry but a prompt change does not serve old answers. Entries are fresh for
+``ttl`` seconds, then served stale (while one background call refreshes
+them) for up to ``stale_ttl`` more. Concurrent misses for the same key are
+coalesced into a single upstream call whose tokens stream to every waiter.
+
+Tiers: an in-memory LRU, plus an optional SQLite file shared by workers and
+surviving restarts (BITA_INSIGHTS_CACHE_DB).
+"""
+import collections
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from bita.insights.backends import InsightError
+
+DEFAULT_TTL = 6 * 60 * 60
+DEFAULT_STALE_TTL = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 512
+# Followers give up on a stalled leader after this long without a new token.
+FOLLOWER_TIMEOUT = 90
+
+FRESH, STALE, MISS = "fresh", "stale", "miss"
+
+Entry = collections.namedtuple("Entry", "text sources created")
+
+
+def normalize_topic(topic):
+    """Case-, width- and whitespace-insensitive form of a topic, without trailing punctuation."""
+    topic = unicodedata.normalize("NFKC", topic).casefold()
+    topic = re.sub(r"\s+", " ", topic).strip()
+    return topic.rstrip(" .!?;:,")
+
+
+def cache_key(topic, system_prompt, generation_config, model):
+    material = json.dumps([normalize_topic(topic), system_prompt, generation_config, model], sort_keys=True)
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class _Flight:
+    """One in-progress upstream call; the leader publishes events, followers tail them."""
+
+    def __init__(self):
+        self.events = []
+        self.done = False
+        self.error = None
+        self.condition = threading.Condition()
+        self.last_activity = time.monotonic()
+
+    def stalled(self):
+        return not self.done and time.monotonic() - self.last_activity > FOLLOWER_TIMEOUT
+
+    def publish(self, event):
+        with self.condition:
+            self.events.append(event)
+            self.last_activity = time.monotonic()
+            self.condition.notify_all()
+
+    def finish(self, error=None):
+        with self.condition:
+            self.done = True
+            self.error = error
+            self.condition.notify_all()
+
+    def follow(self):
+        index = 0
+        while True:
+            with self.condition:
+                while index >= len(self.events) and not self.done:
+                    if not self.condition.wait(FOLLOWER_TIMEOUT):
+                        raise InsightError("Timed out waiting for a shared insight request.")
+                pending = self.events[index:]
+                index = len(self.events)
+                done, error = self.done, self.error
+            yield from pending
+            if done and index >= len(self.events):
+                if error is not None:
+                    raise error
+                return
+
+
+class SQLiteTier:
+    """Second cache tier in a SQLite file; one short-lived connection per call keeps it thread-safe."""
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS insights ("
+                "key TEXT PRIMARY KEY, text TEXT NOT NULL, sources TEXT NOT NULL, created REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def get(self, key):
+        with self._connect() as db:
+            row = db.execute("SELECT text, sources, created FROM insights WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return Entry(row[0], json.loads(row[1]), row[2])
+
+    def put(self, key, entry):
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO insights (key, text, sources, created) VALUES (?, ?, ?, ?)",
+                (key, entry.text, json.dumps(entry.sources), entry.created),
+            )
+
+    def purge(self, older_than):
+        with self._connect() as db:
+            db.execute("DELETE FROM insights WHERE created < ?", (older_than,))
+
+
+class InsightCache:
+    """Two-tier insight cache with TTL, stale-while-revalidate and request coalescing."""
+
+    def __init__(self, ttl=DEFAULT_TTL, stale_ttl=DEFAULT_STALE_TTL, max_entries=DEFAULT_MAX_ENTRIES,
+                 db_path=None, clock=time.time):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.disk = SQLiteTier(db_path) if db_path else None
+        self._memory = collections.OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.counters = collections.Counter()
+
+    # --- Storage ---
+    def lookup(self, key):
+        """``(entry, FRESH|STALE|MISS)`` for ``key``, promoting disk hits into memory."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is None:
+            return None, MISS
+        age = self.clock() - entry.created
+        if age <= self.ttl:
+            return entry, FRESH
+        if age <= self.ttl + self.stale_ttl:
+            return entry, STALE
+        return None, MISS
+
+    def store(self, key, text, sources):
+        entry = Entry(text, sources, self.clock())
+        self._remember(key, entry)
+        if self.disk is not None:
+            self.disk.put(key, entry)
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    # --- Streaming with coalescing ---
+    def stream(self, key, produce):
+        """Events for ``key``: cached if fresh/stale, else from ``produce()`` shared by concurrent callers.
+
+        ``produce`` returns a fresh iterator of ``("text", str)`` /
+        ``("sources", list)`` events; it is called at most once per key at a
+        time.
+        """
+        entry, state = self.lookup(key)
+        self.counters[state] += 1
+        if state == STALE:
+            self._refresh_in_background(key, produce)
+        if entry is not None:
+            return _cached_events(entry)
+
+        with self._lock:
+            flight = self._flights.get(key)
+            # A leader whose visitor never started reading leaves a stalled flight; replace it.
+            leader = flight is None or flight.stalled()
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            self.counters["coalesced"] += 1
+            return flight.follow()
+        return self._lead(key, flight, produce)
+
+    def _lead(self, key, flight, produce):
+        parts, sources = [], []
+        try:
+            for event in produce():
+                if event[0] == "text":
+                    parts.append(event[1])
+                elif event[0] == "sources":
+                    sources = event[1]
+                flight.publish(event)
+                yield event
+        except BaseException as e:  # includes GeneratorExit when the visitor goes away
+            flight.finish(e if isinstance(e, InsightError) else InsightError("The shared insight request was interrupted."))
+            raise
+        else:
+            self.store(key, "".join(parts), sources)
+            flight.finish()
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    def _refresh_in_background(self, key, produce):
+        with self._lock:
+            if key in self._flights and not self._flights[key].stalled():
+                return
+            flight = self._flights[key] = _Flight()
+
+        def refresh():
+            try:
+                for _ in self._lead(key, flight, produce):
+                    pass
+            except Exception:
+                pass  # keep serving the stale entry; the next request retries
+
+        self.counters["refreshes"] += 1
+        threading.Thread(target=refresh, name="insight-refresh", daemon=True).start()
+
+
+def _cached_events(entry):
+    yield ("text", entry.text)
+    yield ("sources", entry.sources)
+
+
+def cache_from_env():
+    """Cache configured by BITA_INSIGHTS_CACHE_TTL / _STALE_TTL / _DB (SQLite path, optional)."""
+    return InsightCache(
+        ttl=float(os.environ.get("BITA_INSIGHTS_CACHE_TTL", DEFAULT_TTL)),
+        stale_ttl=float(os.environ.get("BITA_INSIGHTS_CACHE_STALE_TTL", DEFAULT_STALE_TTL)),
+        db_path=os.environ.get("BITA_INSIGHTS_CACHE_DB") or None,
+    )
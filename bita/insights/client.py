@@ -0,0 +1,129 @@
+"""Insight client: retries with exponential backoff and exposes a streaming result."""
+import contextlib
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from bita.insights.backends import DEFAULT_BASE_URL, GeminiBackend, InsightError, RetryableError
+from bita.insights.cache import cache_from_env, cache_key
+from bita.insights.limiter import get_gate
+
+# Same policy as exponentialBackoffFetch in index.html: up to 5 retries,
+# waiting 2**attempt seconds plus up to 1 s of jitter. A 429 pauses the
+# shared gate for that long, so every session backs off together.
+MAX_RETRIES = 5
+POOL_SIZE = 16
+
+
+def backoff_delay(attempt):
+    return 2 ** attempt + random.random()
+
+
+class InsightStream:
+    """Iterable of text chunks for ``st.write_stream``; ``text``/``sources`` fill in as it is consumed."""
+
+    def __init__(self, events):
+        self._events = events
+        self._parts = []
+        self.sources = []
+        self.done = False
+
+    def __iter__(self):
+        for kind, value in self._events:
+            if kind == "text":
+                self._parts.append(value)
+                yield value
+            elif kind == "sources":
+                self.sources = value
+        self.done = True
+
+    @property
+    def text(self):
+        return "".join(self._parts)
+
+
+class InsightClient:
+    """Generates insights through ``backend``, optionally behind an ``InsightCache``.
+
+    Upstream calls go through ``gate`` (an ``OutboundGate``), which holds a
+    slot for as long as the response is streaming.
+    """
+
+    def __init__(self, backend, cache=None, gate=None, max_retries=MAX_RETRIES, sleep=time.sleep):
+        self.backend = backend
+        self.cache = cache
+        self.gate = gate
+        self.max_retries = max_retries
+        self.sleep = sleep
+
+    def _slot(self, session_id):
+        return self.gate.slot(session_id) if self.gate is not None else contextlib.nullcontext()
+
+    def _events(self, topic, session_id=None):
+        for attempt in range(self.max_retries + 1):
+            with self._slot(session_id):
+                events = self.backend.stream(topic)
+                try:
+                    first = next(events)
+                except StopIteration:
+                    return
+                except RetryableError as e:
+                    error = e
+                else:
+                    yield first
+                    yield from events
+                    return
+            if attempt == self.max_retries:
+                raise InsightError("API request failed after multiple retries.") from error
+            delay = max(error.retry_after or 0, backoff_delay(attempt))
+            if error.rate_limited and self.gate is not None:
+                self.gate.pause(delay)
+            else:
+                self.sleep(delay)
+
+    def stream_insight(self, topic, session_id=None):
+        topic = topic.strip()
+        if not topic:
+            raise InsightError("Please enter a technology or business topic to generate an insight.")
+        if self.cache is None:
+            return InsightStream(self._events(topic, session_id))
+        key = cache_key(
+            topic,
+            getattr(self.backend, "system_prompt", None),
+            getattr(self.backend, "generation_config", None),
+            getattr(self.backend, "model", None),
+        )
+        return InsightStream(self.cache.stream(key, lambda: self._events(topic, session_id)))
+
+
+def make_session(pool_size=POOL_SIZE):
+    """A ``requests.Session`` whose connection pool is shared by all sessions on the worker."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key, base_url=None):
+    """Process-wide client for ``api_key``; BITA_INSIGHTS_BASE_URL points it at another server."""
+    base_url = base_url or os.environ.get("BITA_INSIGHTS_BASE_URL") or DEFAULT_BASE_URL
+    key = (api_key, base_url)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = InsightClient(
+                GeminiBackend(api_key, make_session(), base_url=base_url),
+                cache=cache_from_env(),
+                gate=get_gate(),
+            )
+            _clients[key] = client
+    return client
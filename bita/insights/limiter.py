@@ -0,0 +1,186 @@
+"""Process-wide gate for outbound model calls.
+
+Every upstream call takes a slot from one ``OutboundGate`` per worker
+process. The gate combines:
+
+* a token bucket: at most ``qps`` calls per second, with bursts of ``burst``;
+* a bounded semaphore: at most ``max_in_flight`` streams open at once;
+* a fair queue: waiting sessions are served round-robin, so one visitor
+  clicking repeatedly cannot starve the others;
+* a global pause: a 429 (and its Retry-After) holds back every caller,
+  instead of each session discovering the rate limit on its own.
+
+``stats()`` reports queue depth, in-flight calls and wait times.
+
+Configured by BITA_INSIGHTS_QPS, BITA_INSIGHTS_BURST,
+BITA_INSIGHTS_MAX_IN_FLIGHT and BITA_INSIGHTS_QUEUE_TIMEOUT.
+"""
+import collections
+import contextlib
+import os
+import threading
+import time
+
+from bita.insights.backends import InsightError
+
+DEFAULT_QPS = 2.0
+DEFAULT_BURST = 4
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_QUEUE_TIMEOUT = 60
+
+
+class GateTimeout(InsightError):
+    """No slot became free within the queue timeout."""
+
+
+class TokenBucket:
+    """``rate`` tokens per second, holding at most ``burst``. Not thread-safe on its own."""
+
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self):
+        """Seconds until a token is available (0 if one is available now)."""
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self._refill()
+        self.tokens -= 1
+
+
+class OutboundGate:
+    def __init__(self, qps=DEFAULT_QPS, burst=DEFAULT_BURST, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                 queue_timeout=DEFAULT_QUEUE_TIMEOUT, clock=time.monotonic):
+        self.bucket = TokenBucket(qps, burst, clock)
+        self.max_in_flight = max_in_flight
+        self.queue_timeout = queue_timeout
+        self.clock = clock
+        self.in_flight = 0
+        self.paused_until = 0.0
+        # session id -> deque of waiting tickets; dict order is the round-robin order.
+        self._queues = collections.OrderedDict()
+        self._condition = threading.Condition()
+        self.counters = collections.Counter()
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    # --- Queue ---
+    def _head(self):
+        for queue in self._queues.values():
+            return queue[0]
+        return None
+
+    def _dequeue(self, session_id, ticket):
+        queue = self._queues[session_id]
+        head = queue[0] is ticket
+        queue.remove(ticket)
+        if not queue:
+            del self._queues[session_id]
+        elif head:
+            # Served: this session goes to the back of the line.
+            self._queues.move_to_end(session_id)
+
+    def _blocked_for(self):
+        """Seconds the head of the queue still has to wait, or None to wait for a release."""
+        if self.in_flight >= self.max_in_flight:
+            return None
+        return max(self.paused_until - self.clock(), self.bucket.delay(), 0.0)
+
+    # --- Slots ---
+    def acquire(self, session_id=None):
+        """Wait for a slot; returns the seconds spent waiting. Raises ``GateTimeout``."""
+        ticket = object()
+        start = self.clock()
+        deadline = start + self.queue_timeout
+        with self._condition:
+            self._queues.setdefault(session_id, collections.deque()).append(ticket)
+            try:
+                while True:
+                    if self._head() is ticket:
+                        blocked_for = self._blocked_for()
+                        if blocked_for == 0:
+                            break
+                    else:
+                        blocked_for = None
+                    remaining = deadline - self.clock()
+                    if remaining <= 0:
+                        self.counters["timeouts"] += 1
+                        raise GateTimeout("The insight service is busy right now")
+                    self._condition.wait(remaining if blocked_for is None else min(blocked_for, remaining))
+            finally:
+                self._dequeue(session_id, ticket)
+                # The next head may already be able to go.
+                self._condition.notify_all()
+            self.bucket.take()
+            self.in_flight += 1
+            waited = self.clock() - start
+            self.counters["acquired"] += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+        return waited
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def slot(self, session_id=None):
+        self.acquire(session_id)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def pause(self, seconds):
+        """Hold back every caller for ``seconds`` (e.g. a 429's Retry-After)."""
+        with self._condition:
+            self.paused_until = max(self.paused_until, self.clock() + seconds)
+            self.counters["pauses"] += 1
+            self._condition.notify_all()
+
+    # --- Metrics ---
+    def stats(self):
+        with self._condition:
+            acquired = self.counters["acquired"]
+            return {
+                "queue_depth": sum(len(q) for q in self._queues.values()),
+                "sessions_waiting": len(self._queues),
+                "in_flight": self.in_flight,
+                "acquired": acquired,
+                "timeouts": self.counters["timeouts"],
+                "pauses": self.counters["pauses"],
+                "paused_for": max(self.paused_until - self.clock(), 0.0),
+                "wait_avg": self.wait_total / acquired if acquired else 0.0,
+                "wait_max": self.wait_max,
+            }
+
+
+_gate = None
+_gate_lock = threading.Lock()
+
+
+def get_gate():
+    """The process-wide gate, configured from the environment on first use."""
+    global _gate
+    with _gate_lock:
+        if _gate is None:
+            _gate = OutboundGate(
+                qps=float(os.environ.get("BITA_INSIGHTS_QPS", DEFAULT_QPS)),
+                burst=int(os.environ.get("BITA_INSIGHTS_BURST", DEFAULT_BURST)),
+                max_in_flight=int(os.environ.get("BITA_INSIGHTS_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT)),
+                queue_timeout=float(os.environ.get("BITA_INSIGHTS_QUEUE_TIMEOUT", DEFAULT_QUEUE_TIMEOUT)),
+            )
+        return _gate
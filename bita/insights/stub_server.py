@@ -0,0 +1,118 @@
+"""Local stand-in for the Gemini streaming API, for development and tests.
+
+    python -m bita.insights.stub_server --port 8765 [--delay 0.05] [--fail-first 2]
+    BITA_INSIGHTS_BASE_URL=http://127.0.0.1:8765 GEMINI_API_KEY=stub streamlit run app.py
+
+Answers ``POST /v1beta/models/<model>:streamGenerateContent?alt=sse`` with a
+canned analysis of the requested topic, streamed word by word as
+server-sent events, plus one grounding source. ``--fail-first N`` answers
+the first N requests with HTTP 429 to exercise the retry path.
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ANSWER = (
+    "{topic} is moving from experimentation to core architecture. Leaders should treat it as a "
+    "platform decision: standardise the data contracts, automate governance, and measure value "
+    "per workload rather than per project. The firms that win will pair it with strong observability "
+    "and a clear cost model, so that scaling up never outpaces the ability to operate it safely."
+)
+SOURCE = {"uri": "https://example.com/insights", "title": "Example industry report"}
+_PATH_RE = re.compile(r"^/v1beta/models/[^/:]+:streamGenerateContent")
+
+
+class StubState:
+    def __init__(self, delay=0.05, fail_first=0):
+        self.delay = delay
+        self.fail_remaining = fail_first
+        self.requests = 0
+        self.received = []  # (time.monotonic(), topic) per answered request, in arrival order
+        self.lock = threading.Lock()
+
+
+def _topic(payload):
+    text = payload["contents"][0]["parts"][0]["text"]
+    match = re.search(r'topic: "(.*)"\.$', text, re.S)
+    return match.group(1) if match else text
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status, body):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = self.rfile.read(length)
+            with state.lock:
+                state.requests += 1
+                fail = state.fail_remaining > 0
+                state.fail_remaining -= int(fail)
+            if not _PATH_RE.match(self.path):
+                self._send_json(404, {"error": {"message": "Not found"}})
+                return
+            if fail:
+                self._send_json(429, {"error": {"message": "Resource has been exhausted"}})
+                return
+
+            topic = _topic(json.loads(body))
+            with state.lock:
+                state.received.append((time.monotonic(), topic))
+            words = ANSWER.format(topic=topic).split(" ")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for i, word in enumerate(words):
+                candidate = {"content": {"parts": [{"text": word + (" " if i < len(words) - 1 else "")}]}}
+                if i == len(words) - 1:
+                    candidate["groundingMetadata"] = {"groundingChunks": [{"web": SOURCE}]}
+                self.wfile.write(f"data: {json.dumps({'candidates': [candidate]})}\r\n\r\n".encode())
+                self.wfile.flush()
+                time.sleep(state.delay)
+            self.close_connection = True
+
+    return Handler
+
+
+def serve(host="127.0.0.1", port=0, delay=0.05, fail_first=0):
+    """Start the stub in a daemon thread; returns ``(server, state)``. ``server.server_port`` has the port."""
+    state = StubState(delay, fail_first)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.05, help="seconds between streamed words")
+    parser.add_argument("--fail-first", type=int, default=0, help="answer this many requests with HTTP 429")
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(StubState(args.delay, args.fail_first)))
+    print(f"stub model API on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Streamlit section for the AI Insight Generator (mirrors the section in index.html)."""
+import html
+import os
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from streamlit.runtime.secrets import SECRETS_FILE_LOCS
+
+from bita.insights.backends import InsightError
+from bita.insights.client import get_client
+
+INTRO = (
+    "As a leading AI firm, we use deep learning models to generate cutting-edge market insights. "
+    "Enter any technology or business topic below and get a concise, real-time expert analysis "
+    "for your next strategy meeting or blog post."
+)
+
+
+def configured_api_key():
+    """GEMINI_API_KEY from the environment, else from .streamlit/secrets.toml; None if unset."""
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if api_key:
+        return api_key
+    # Without a secrets file st.secrets renders an st.error banner before raising, so never touch it then.
+    if not any(os.path.exists(path) for path in SECRETS_FILE_LOCS):
+        return None
+    return st.secrets.get("GEMINI_API_KEY")
+
+
+def _render_sources(sources):
+    if sources:
+        items = "".join(
+            f'<li><a href="{html.escape(s["uri"])}" target="_blank">{html.escape(s["title"])}</a></li>'
+            for s in sources
+        )
+    else:
+        items = "<li>No specific web sources cited for this high-level analysis.</li>"
+    st.markdown(
+        f'<h4 style="color: #9ca3af;">Sources:</h4><ul style="color: #6b7280; font-size: 0.875rem;">{items}</ul>',
+        unsafe_allow_html=True,
+    )
+
+
+def _generate(api_key, topic):
+    """Stream one insight into the page; returns True if it was rendered."""
+    try:
+        ctx = get_script_run_ctx()
+        stream = get_client(api_key).stream_insight(topic, session_id=ctx.session_id if ctx else None)
+        st.markdown("### Generated Expert Analysis:")
+        st.write_stream(stream)
+    except InsightError as e:
+        st.session_state.error_message = f"Error generating insight: {e}. Please try a different topic."
+        return False
+    st.session_state.insight_data = {"topic": topic.strip(), "text": stream.text, "sources": stream.sources}
+    return True
+
+
+def render_insight_generator():
+    """The insight section; hidden when no API key is configured.
+
+    Results live in ``st.session_state.insight_data`` / ``error_message`` so
+    they survive reruns triggered by the rest of the page.
+    """
+    api_key = configured_api_key()
+    if not api_key:
+        return
+
+    st.markdown('<div id="insights"></div>', unsafe_allow_html=True)
+    st.markdown(
+        f"""<h2 class="contact-header">✨ AI Insight Generator</h2>
+        <p style="color: #9ca3af; margin-bottom: 1.5rem; max-width: 48rem;">{INTRO}</p>""",
+        unsafe_allow_html=True,
+    )
+    topic = st.text_area(
+        "Topic", key="insight_topic", label_visibility="collapsed",
+        placeholder="e.g., The impact of serverless computing on FinTech architecture",
+    )
+
+    streamed = False
+    if st.button("Generate Expert Insight ✨"):
+        st.session_state.insight_data = None
+        st.session_state.error_message = None
+        if not topic.strip():
+            st.session_state.error_message = "Please enter a technology or business topic to generate an insight."
+        else:
+            streamed = _generate(api_key, topic)
+
+    if st.session_state.error_message:
+        st.error(st.session_state.error_message)
+
+    insight_data = st.session_state.insight_data
+    if insight_data:
+        if not streamed:
+            st.markdown("### Generated Expert Analysis:")
+            st.write(insight_data["text"])
+        _render_sources(insight_data["sources"])
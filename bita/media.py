@@ -0,0 +1,194 @@
+"""Background media for the landing variants (app9/app10/app11).
+
+Animated GIFs become looping muted MP4/WebM when ffmpeg is on PATH, and an
+animated WebP via Pillow otherwise; stills become WebP. Results are written
+once per source content hash under static/media/ and served as static URLs,
+instead of base64-inlining the original file into CSS on every rerun. The
+output names carry the hash, so a new process reuses the files an earlier
+one wrote rather than encoding again.
+"""
+import collections
+import io
+import os
+import shutil
+import subprocess
+import threading
+
+from PIL import Image, ImageSequence
+
+from bita import encoding
+from bita.assets import file_sha256
+from bita.static import static_path, static_serving_enabled, static_url
+
+OUTPUT_RELDIR = "media"
+WEBP_QUALITY = 80
+ANIMATED_WEBP_QUALITY = 70
+MP4_CRF = 28
+WEBM_CRF = 40
+
+MIME_TYPES = {".webp": "image/webp", ".mp4": "video/mp4", ".webm": "video/webm"}
+
+# url: CSS background (the still, animated WebP, or the video's poster frame).
+# videos: [(url, mime), ...] for a <video> element; empty for image backgrounds.
+Background = collections.namedtuple("Background", "url videos")
+
+_lock = threading.Lock()
+_by_signature = {}  # (path, mtime_ns, size) -> outputs
+_by_digest = {}  # sha256 -> outputs
+
+
+def _write(relpath, data):
+    out_path = static_path(relpath)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, out_path)
+
+
+def _encode_webp(image, **options):
+    buffer = io.BytesIO()
+    image.save(buffer, format="WEBP", **options)
+    return buffer.getvalue()
+
+
+def _animated_webp(image):
+    frames, durations = [], []
+    for frame in ImageSequence.Iterator(image):
+        frames.append(frame.convert("RGBA"))
+        durations.append(frame.info.get("duration", image.info.get("duration", 100)) or 100)
+    return _encode_webp(frames[0], save_all=True, append_images=frames[1:], duration=durations,
+                        loop=0, quality=ANIMATED_WEBP_QUALITY, method=4)
+
+
+def _ffmpeg(source, out_path, codec_args):
+    """Encode ``source`` with ffmpeg; returns False if ffmpeg fails."""
+    tmp_path = out_path + ".tmp" + os.path.splitext(out_path)[1]
+    command = [
+        "ffmpeg", "-y", "-v", "error", "-i", source,
+        # Even dimensions and yuv420p: required by H.264 and what browsers decode natively.
+        "-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2", "-pix_fmt", "yuv420p", "-an",
+        *codec_args, tmp_path,
+    ]
+    try:
+        subprocess.run(command, check=True, capture_output=True, timeout=300)
+    except (OSError, subprocess.SubprocessError):
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, out_path)
+    return True
+
+
+def _output_paths(source, digest):
+    """Relative paths of every output ``source`` can have: image, poster, webm, mp4."""
+    stem = os.path.splitext(os.path.basename(source))[0]
+    prefix = f"{OUTPUT_RELDIR}/{stem}"
+    suffix = f"-{digest[:10]}"
+    return {
+        "image": prefix + suffix + ".webp",
+        "poster": prefix + "-poster" + suffix + ".webp",
+        "webm": prefix + suffix + ".webm",
+        "mp4": prefix + suffix + ".mp4",
+    }
+
+
+def _existing(source, digest):
+    """The outputs already on disk for ``digest`` (e.g. from an earlier process), or None.
+
+    The poster is written after the videos, so a poster means they are complete.
+    """
+    paths = _output_paths(source, digest)
+    if os.path.exists(static_path(paths["poster"])):
+        videos = [paths[kind] for kind in ("webm", "mp4") if os.path.exists(static_path(paths[kind]))]
+        if videos:
+            return {"image": paths["poster"], "videos": videos}
+    if os.path.exists(static_path(paths["image"])):
+        return {"image": paths["image"], "videos": []}
+    return None
+
+
+def _transcode(source, digest):
+    """Write the static outputs for one source; returns {"image": relpath, "videos": [relpath, ...]}."""
+    paths = _output_paths(source, digest)
+    with Image.open(source) as image:
+        animated = getattr(image, "is_animated", False)
+        if not animated:
+            _write(paths["image"], _encode_webp(image.convert("RGBA" if image.has_transparency_data else "RGB"),
+                                                quality=WEBP_QUALITY, method=6))
+            return {"image": paths["image"], "videos": []}
+
+        videos = []
+        if shutil.which("ffmpeg"):
+            targets = (
+                (paths["webm"], ["-c:v", "libvpx-vp9", "-crf", str(WEBM_CRF), "-b:v", "0"]),
+                (paths["mp4"], ["-c:v", "libx264", "-crf", str(MP4_CRF), "-preset", "slow",
+                                "-movflags", "+faststart"]),
+            )
+            videos = [relpath for relpath, args in targets if _ffmpeg(source, static_path(relpath), args)]
+        if videos:
+            # The poster paints the first frame while the video starts.
+            relpath = paths["poster"]
+            image.seek(0)
+            _write(relpath, _encode_webp(image.convert("RGB"), quality=WEBP_QUALITY, method=6))
+        else:
+            relpath = paths["image"]
+            _write(relpath, _animated_webp(image))
+        return {"image": relpath, "videos": videos}
+
+
+def transcode(source):
+    """Static outputs for ``source``, encoding only when none are on disk for its content hash.
+
+    Raises FileNotFoundError if ``source`` does not exist.
+    """
+    stat = os.stat(source)
+    signature = (os.path.abspath(source), stat.st_mtime_ns, stat.st_size)
+    outputs = _by_signature.get(signature)
+    if outputs is not None:
+        return outputs
+    with _lock:
+        outputs = _by_signature.get(signature)
+        if outputs is None:
+            digest = file_sha256(source)
+            outputs = _by_digest.get(digest)
+            paths = [outputs["image"], *outputs["videos"]] if outputs else []
+            if not outputs or not all(os.path.exists(static_path(p)) for p in paths):
+                outputs = _existing(source, digest) or _transcode(source, digest)
+                _by_digest[digest] = outputs
+            _by_signature[signature] = outputs
+    return outputs
+
+
+def _mime(relpath):
+    return MIME_TYPES[os.path.splitext(relpath)[1]]
+
+
+def get_background(source):
+    """URLs for using ``source`` as a page background.
+
+    With static serving off the still/animated WebP is inlined as a data URL
+    and no video is offered.
+    """
+    outputs = transcode(source)
+    if not static_serving_enabled():
+        return Background(encoding.data_url(static_path(outputs["image"]), _mime(outputs["image"])), [])
+    return Background(static_url(outputs["image"]), [(static_url(p), _mime(p)) for p in outputs["videos"]])
+
+
+def video_background_html(background):
+    """A muted, looping ``<video>`` behind the page content, or "" for image backgrounds.
+
+    The video sits at z-index -1, so Streamlit's own app containers are made
+    transparent for it to show through; the poster frame covers the time
+    before playback starts.
+    """
+    if not background.videos:
+        return ""
+    sources = "".join(f'<source src="{url}" type="{mime}">' for url, mime in background.videos)
+    return (
+        '<style>.stApp, [data-testid="stAppViewContainer"] { background: transparent !important; }</style>'
+        f'<video autoplay muted loop playsinline poster="{background.url}" '
+        'style="position: fixed; inset: 0; width: 100vw; height: 100vh; object-fit: cover; '
+        f'z-index: -1; pointer-events: none;">{sources}</video>'
+    )
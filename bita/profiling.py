@@ -0,0 +1,210 @@
+"""Opt-in per-rerun profiling of page sections.
+
+    with start_profile("home") as profile:
+        profile.mark("navbar")       # everything until the next mark counts as "navbar"
+        render_navbar("home")
+        profile.mark("slides")
+        ...
+
+A profile is active when BITA_PROFILE=1 is set (every session) or the page
+is opened with ``?profile=1`` (that session only); otherwise
+``start_profile`` returns a no-op profile that costs nothing. Marks keep
+the page a flat script; each section records its wall time plus the number
+and serialized size of the ForwardMsgs it enqueued, counted by wrapping the
+run's ``ScriptRunContext._enqueue``. The context is reused by the session's
+next run, so leaving the ``with`` block always puts the original back, also
+on ``st.stop()``, a rerun or an exception. A run that completes shows a
+collapsible timing table when profiling was asked for with ``?profile=1``
+or BITA_PROFILE=table.
+
+Section timings also accumulate process-wide and, with
+BITA_METRICS_PORT=<port>, are served in Prometheus text format at
+``http://127.0.0.1:<port>/metrics``, together with the insight rate-limiter
+and base64 cache statistics.
+"""
+import collections
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+Section = collections.namedtuple("Section", "name seconds messages bytes")
+
+# (page, section) -> [count, seconds, messages, bytes]; summed over every profiled run.
+_totals = collections.defaultdict(lambda: [0, 0.0, 0, 0])
+_totals_lock = threading.Lock()
+_metrics_server = {"server": None}
+
+
+class _NullProfile:
+    active = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def mark(self, name):
+        pass
+
+    def finish(self):
+        pass
+
+
+NULL_PROFILE = _NullProfile()
+
+
+class Profile:
+    """Timers and ForwardMsg byte counters for the sections of one script run."""
+
+    active = True
+
+    def __init__(self, page, show_table, ctx):
+        self.page = page
+        self.show_table = show_table
+        self.sections = []
+        self._ctx = ctx
+        self._messages = 0
+        self._bytes = 0
+        self._started = time.perf_counter()
+        self._open = None  # (name, start, messages, bytes) of the running section
+        self._enqueue = ctx._enqueue
+
+        def counting_enqueue(msg):
+            self._messages += 1
+            self._bytes += msg.ByteSize()
+            self._enqueue(msg)
+
+        ctx._enqueue = counting_enqueue
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.finish()
+        else:
+            self._restore()  # interrupted run: nothing to record and no page left to show the table on
+        return False
+
+    def _restore(self):
+        if self._enqueue is not None:
+            self._ctx._enqueue = self._enqueue
+            self._enqueue = None
+
+    def _close(self):
+        if self._open is not None:
+            name, start, messages, sent = self._open
+            self.sections.append(
+                Section(name, time.perf_counter() - start, self._messages - messages, self._bytes - sent)
+            )
+            self._open = None
+
+    def mark(self, name):
+        """End the running section and start ``name``."""
+        self._close()
+        self._open = (name, time.perf_counter(), self._messages, self._bytes)
+
+    def finish(self):
+        """Stop counting, record the totals and show the table if it was asked for; only the first call counts."""
+        if self._enqueue is None:
+            return
+        self._close()
+        self._restore()
+        total = time.perf_counter() - self._started
+        with _totals_lock:
+            for section in self.sections + [Section("(total)", total, self._messages, self._bytes)]:
+                entry = _totals[(self.page, section.name)]
+                entry[0] += 1
+                entry[1] += section.seconds
+                entry[2] += section.messages
+                entry[3] += section.bytes
+        if self.show_table:
+            self._render_table(total)
+
+    def _render_table(self, total):
+        rows = "".join(
+            f"| {s.name} | {s.seconds * 1000:.1f} | {s.messages} | {s.bytes:,} |\n" for s in self.sections
+        )
+        with st.expander(f"⏱ Render profile: {total * 1000:.1f} ms, {self._bytes:,} bytes"):
+            st.markdown(
+                "| Section | ms | Messages | Bytes |\n|---|---:|---:|---:|\n" + rows
+                + f"| **Total** | **{total * 1000:.1f}** | **{self._messages}** | **{self._bytes:,}** |"
+            )
+
+
+def start_profile(page):
+    """A ``Profile`` for this run when profiling is enabled, else a no-op profile."""
+    env = os.environ.get("BITA_PROFILE", "").lower()
+    env = "" if env in ("0", "false", "no", "off") else env
+    requested = st.query_params.get("profile") == "1"
+    ctx = get_script_run_ctx()
+    if ctx is None or not (env or requested):
+        return NULL_PROFILE
+    start_metrics_server()
+    return Profile(page, show_table=requested or env == "table", ctx=ctx)
+
+
+# --- Prometheus export ---
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def metrics_text():
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    with _totals_lock:
+        totals = {key: list(value) for key, value in _totals.items()}
+    for metric, index, kind, help_text in (
+        ("bita_section_runs_total", 0, "counter", "Profiled runs of a page section."),
+        ("bita_section_seconds_total", 1, "counter", "Wall time spent in a page section."),
+        ("bita_section_messages_total", 2, "counter", "ForwardMsgs enqueued by a page section."),
+        ("bita_section_bytes_total", 3, "counter", "Serialized ForwardMsg bytes enqueued by a page section."),
+    ):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+        for (page, section), values in sorted(totals.items()):
+            lines.append(f'{metric}{{page="{_label(page)}",section="{_label(section)}"}} {values[index]}')
+
+    from bita import encoding
+    from bita.insights.limiter import get_gate
+
+    for key, value in sorted(get_gate().stats().items()):
+        lines += [f"# TYPE bita_insight_gate_{key} gauge", f"bita_insight_gate_{key} {value}"]
+    for key, value in sorted(encoding.stats().items()):
+        if isinstance(value, (int, float)):
+            lines += [f"# TYPE bita_base64_cache_{key} gauge", f"bita_base64_cache_{key} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_metrics_server():
+    """Serve /metrics on 127.0.0.1:$BITA_METRICS_PORT, once per process; no-op without the variable."""
+    port = os.environ.get("BITA_METRICS_PORT")
+    if not port:
+        return None
+    with _totals_lock:
+        if _metrics_server["server"] is None:
+            server = ThreadingHTTPServer(("127.0.0.1", int(port)), _MetricsHandler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+            _metrics_server["server"] = server
+    return _metrics_server["server"]
@@ -0,0 +1,189 @@
+"""Home page sections rendered from the content model (bita/content.py), shared by app.py and bita/export.py.
+
+``get_home()`` returns every fragment of the page pre-built as HTML. The
+fragments are built once per content version (and sprite / static URL
+prefix, which the logos depend on) and then shared by all sessions, so a
+rerun only looks them up instead of formatting strings.
+
+Adjacent static fragments are also joined into ``Home.blocks``, one
+``st.markdown`` each: every element costs a ForwardMsg (protobuf
+serialization, a websocket frame, a React node), and the service cards
+use a CSS grid (``.service-grid``) instead of ``st.columns(5)``, which
+was eleven elements on its own. A block's ``digest`` changes exactly when
+its HTML does.
+"""
+import collections
+import hashlib
+import html
+import textwrap
+import threading
+
+from bita.content import get_content
+from bita.static import static_serving_enabled, static_url
+from bita.tool_logos import get_sprite, logo_html
+
+# Define common logo sizes for key tools; the logos themselves are self-hosted (see bita/tool_logos.py)
+LOGO_SIZE = 35
+LOGO_STYLE = "height: 35px; width: 35px; vertical-align: middle; margin-right: 8px; border-radius: 4px;"
+
+Deck = collections.namedtuple("Deck", "anchor slides")
+Block = collections.namedtuple("Block", "html digest")
+Home = collections.namedtuple(
+    "Home",
+    "version error title icon hero services_anchor services_header cards decks "
+    "contact_anchor contact_intro contact_details copyright blocks",
+)
+Home.__doc__ = """Pre-built HTML fragments of the home page for one content version."""
+
+_lock = threading.Lock()
+_built = {}
+
+
+def _text(value):
+    return html.escape(str(value), quote=False)
+
+
+def _attr(value):
+    return html.escape(str(value))
+
+
+# --- Fragments ---
+def hero_html(hero):
+    return f"""
+    <div style="max-width: 1280px; margin: 0 auto;">
+        <h1 class="hero-title-main">
+            {_text(hero["lead"])}
+            <span class="keyword-primary">{_text(hero["primary"])}</span>:
+            <br>
+            {_text(hero["middle"])}
+            <span class="keyword-secondary">{_text(hero["secondary"])}</span>
+            {_text(hero["tail"])}
+        </h1>
+    </div>
+"""
+
+
+def services_header_html(services):
+    return f"""
+    <div>
+        <h2 style="color: white; font-size: 1.875rem; font-weight: 700; margin-bottom: 2rem; border-left: 4px solid #00e0ff; padding-left: 1rem;">
+            {_text(services["title"])}
+        </h2>
+    </div>
+"""
+
+
+def service_card_html(card):
+    """One service card; the logo is a sprite cell, or the remote image when it is not vendored."""
+    logo = logo_html(card["logo"], LOGO_SIZE, alt=card["title"], style=LOGO_STYLE)
+    return (
+        f'<div class="service-card"><p class="card-title">{logo}{_text(card["title"])}</p>'
+        f'<p style="color: #9ca3af;">{_text(card["text"])}</p></div>'
+    )
+
+
+def contact_intro_html(contact):
+    return f"""
+    <div style="padding: 0 1rem;">
+        <h2 class="contact-header">
+            {_text(contact["title"])}
+        </h2>
+        <p style="color: #9ca3af; margin-bottom: 2rem; max-width: 600px;">
+            {_text(contact["intro"])}
+        </p>
+    </div>
+"""
+
+
+def contact_details_html(contact):
+    return f"""
+    <div style="text-align: center; color: #e5e7eb; padding: 1rem 0; background-color: #000; border-top: 1px solid #1f2937;">
+        <strong style="color: #00e0ff;">Contact Details:</strong><br>
+        Email: <a href="mailto:{_attr(contact["email"])}" style="color: #6b7280; text-decoration: none;">{_text(contact["email"])}</a><br>
+        Phone: <a href="tel:{_attr(contact["phone"])}" style="color: #6b7280; text-decoration: none;">{_text(contact["phone_label"])}</a><br>
+        Address: {_text(contact["address"])}
+    </div>
+    """
+
+
+def copyright_html(contact):
+    return (
+        "<p style='text-align: center; color: #6b7280; font-size: 0.875rem; background-color: #000; "
+        f"padding-bottom: 1rem; margin: 0;'>{_text(contact['copyright'])}</p>"
+    )
+
+
+def anchor_html(anchor):
+    return f'<div id="{_attr(anchor)}"></div>'
+
+
+def block(*fragments):
+    """Adjacent static fragments joined into one element.
+
+    Each fragment is dedented on its own and none leaves a blank line, so
+    markdown keeps the whole block as raw HTML instead of turning indented
+    lines into a code block.
+    """
+    markup = "\n".join(textwrap.dedent(fragment).strip() for fragment in fragments)
+    return Block(markup, hashlib.sha256(markup.encode()).hexdigest()[:10])
+
+
+def build_home(content):
+    """Render every fragment of ``content`` (a ``Content``)."""
+    data = content.data
+    services, contact = data["services"], data["contact"]
+    home = Home(
+        version=content.version,
+        error=content.error,
+        title=data["page"]["title"],
+        icon=data["page"]["icon"],
+        hero=hero_html(data["hero"]),
+        services_anchor=anchor_html(services["anchor"]),
+        services_header=services_header_html(services),
+        cards=tuple(service_card_html(card) for card in services["cards"]),
+        decks={name: Deck(deck["anchor"], tuple(deck["slides"])) for name, deck in data["decks"].items()},
+        contact_anchor=anchor_html(contact["anchor"]),
+        contact_intro=contact_intro_html(contact),
+        contact_details=contact_details_html(contact),
+        copyright=copyright_html(contact),
+        blocks={},
+    )
+    home.blocks.update(
+        # Hero, "Core Data & Analytics Platform" header and the service cards.
+        intro=block(home.hero, home.services_anchor, home.services_header,
+                    '<div class="service-grid">', *home.cards, "</div>"),
+        # Details and copyright line; pages/ourstar.py shows only this part.
+        footer=block(home.contact_details, home.copyright),
+    )
+    home.blocks["contact"] = block(
+        # The anchor goes first: a leading <div> keeps the block raw HTML for markdown.
+        home.contact_anchor, "<br><br>", home.contact_intro, "<br><br>", home.blocks["footer"].html,
+    )
+    return home
+
+
+def _logo_key():
+    """What the card logos depend on besides the content: the static URL prefix and the sprite."""
+    if not static_serving_enabled():
+        return None
+    try:
+        sprite = get_sprite()
+    except OSError:
+        sprite = None
+    return static_url(""), sprite["relpath"] if sprite else None
+
+
+def get_home(path=None):
+    """The home page fragments for the current content, built once per version and shared by every session."""
+    content = get_content(path)
+    key = (content.path, content.version, content.error, _logo_key())
+    home = _built.get(key)
+    if home is None:
+        with _lock:
+            home = _built.get(key)
+            if home is None:
+                home = build_home(content)
+                if len(_built) >= 8:
+                    _built.clear()
+                _built[key] = home
+    return home
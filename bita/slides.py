@@ -0,0 +1,109 @@
+"""Slide catalog shared by every session, plus a thin uncached renderer.
+
+Loading (stat, decode, validate, size) happens once per process in a
+``st.cache_resource`` catalog and is redone for a file only when its mtime
+or size changes. Rendering only emits elements from the catalog, so a new
+session costs no disk reads.
+"""
+import collections
+import io
+import os
+import threading
+import time
+
+import streamlit as st
+from PIL import Image
+
+from bita import assets
+from bita.static import static_serving_enabled
+
+# Files are re-stat'ed at most this often; edits show up within this window.
+REFRESH_SECONDS = 5.0
+
+Slide = collections.namedtuple("Slide", "path width height bytes picture data")
+Slide.__doc__ = """One validated slide: ``picture`` markup when variants are built, else raw ``data`` for st.image."""
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def load_slide(path, use_variants=True):
+    """Read, decode and validate one slide; returns None if it is missing or corrupt."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        with Image.open(io.BytesIO(data)) as image:
+            width, height = image.size
+            image.verify()
+    except (OSError, SyntaxError):
+        return None
+    picture = assets.picture_html(path) if use_variants else None
+    # Keep the bytes only when st.image has to serve them, so sessions never re-read the file.
+    return Slide(path, width, height, len(data), picture, None if picture else data)
+
+
+class SlideCatalog:
+    """Process-wide slide cache keyed by path and invalidated by file mtime/size."""
+
+    def __init__(self, refresh_seconds=REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._entries = {}  # path -> (signature, manifest, slide or None, checked_at)
+
+    def slide(self, path):
+        now = time.monotonic()
+        entry = self._entries.get(path)
+        if entry and now - entry[3] < self.refresh_seconds:
+            return entry[2]
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and now - entry[3] < self.refresh_seconds:
+                return entry[2]
+            signature = _signature(path)
+            manifest = assets.load_manifest()
+            if entry and entry[0] == signature and entry[1] is manifest:
+                slide = entry[2]
+            else:
+                slide = load_slide(path, static_serving_enabled()) if signature else None
+            self._entries[path] = (signature, manifest, slide, now)
+            return slide
+
+    def slides(self, paths):
+        """Valid slides for ``paths``, in order, skipping missing or unreadable files."""
+        return [slide for slide in map(self.slide, paths) if slide is not None]
+
+
+@st.cache_resource(show_spinner=False)
+def get_catalog():
+    return SlideCatalog()
+
+
+def render_slideshow(slides, section_id=None):
+    """Emit a slideshow for already-loaded slides. Deliberately uncached: it only builds elements.
+
+    Slides with built variants are lazy ``<picture>`` elements, so the whole
+    deck goes out as one small markdown delta and the browser fetches each
+    slide only as it approaches the viewport. Slides without variants fall
+    back to ``st.image``, which ships the image eagerly.
+    """
+    pending = [f'<div id="{section_id}"></div>'] if section_id else []
+
+    for slide in slides:
+        if slide.picture:
+            pending.append(f'<div class="stretched-image-container">{slide.picture}</div><br>')
+            continue
+        if pending:
+            st.markdown("".join(pending), unsafe_allow_html=True)
+            pending = []
+        st.markdown('<div class="stretched-image-container">', unsafe_allow_html=True)
+        st.image(slide.data)
+        st.markdown('</div>', unsafe_allow_html=True)
+        st.markdown('<br>', unsafe_allow_html=True)
+
+    if pending:
+        st.markdown("".join(pending), unsafe_allow_html=True)
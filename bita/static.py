@@ -0,0 +1,104 @@
+"""Streamlit static file serving: where files live and how pages link them."""
+import contextlib
+import os
+import re
+
+from bita import ROOT_DIR
+
+# Streamlit serves <main script dir>/static at "app/static/" when
+# server.enableStaticServing is on (see .streamlit/config.toml).
+STATIC_DIR = os.path.join(ROOT_DIR, "static")
+STATIC_URL_PREFIX = "app/static/"
+
+# Set while ``exporting`` renders pages for a plain web server (bita/export.py).
+_export = {"prefix": None}
+
+
+def static_path(relpath):
+    """Absolute filesystem path of a file under static/."""
+    return os.path.join(STATIC_DIR, *relpath.split("/"))
+
+
+def static_url(relpath, version=None):
+    """URL of a file under static/, relative so it also works behind a baseUrlPath."""
+    url = (_export["prefix"] or STATIC_URL_PREFIX) + relpath
+    if version:
+        url += f"?v={version}"
+    return url
+
+
+def static_serving_enabled():
+    """True when the running Streamlit server (or the static export) exposes static/ over HTTP."""
+    if _export["prefix"] is not None:
+        return True
+    try:
+        import streamlit as st
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+@contextlib.contextmanager
+def exporting(url_prefix):
+    """Link files under static/ as ``<url_prefix><relpath>`` instead of Streamlit's ``app/static/``.
+
+    Not thread-safe: only the export CLI uses it, never a running server.
+    """
+    previous = _export["prefix"]
+    _export["prefix"] = url_prefix
+    try:
+        yield
+    finally:
+        _export["prefix"] = previous
+
+
+# --- Response headers ---
+# Fingerprinted files ("name-<10 hex>.ext") never change under the same URL,
+# so browsers and CDNs may keep them for a year without revalidating.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+_FINGERPRINT_RE = re.compile(r"-[0-9a-f]{10}\.[A-Za-z0-9]+$")
+
+# Streamlit only sends a real Content-Type for a few image extensions and
+# serves everything else as text/plain with nosniff, which browsers refuse
+# to apply as a stylesheet and may refuse to play as video.
+EXTRA_CONTENT_TYPES = {
+    ".avif": "image/avif",
+    ".css": "text/css; charset=utf-8",
+    ".mp4": "video/mp4",
+    ".webm": "video/webm",
+}
+_patched = False
+
+
+def is_fingerprinted(path):
+    return bool(_FINGERPRINT_RE.search(path))
+
+
+def install_static_headers():
+    """Patch Streamlit's static handler: immutable caching and correct types for our assets.
+
+    Streamlit's handler only sets long-lived caching when a ``?v=`` argument
+    is present and never marks responses immutable. Safe to call on every
+    rerun; the handler class is patched once per process.
+    """
+    global _patched
+    if _patched:
+        return
+    try:
+        from streamlit.web.server.app_static_file_handler import AppStaticFileHandler
+    except ImportError:
+        return
+
+    original = AppStaticFileHandler.set_extra_headers
+
+    def set_extra_headers(self, path):
+        original(self, path)
+        content_type = EXTRA_CONTENT_TYPES.get(os.path.splitext(path)[1].lower())
+        if content_type:
+            self.set_header("Content-Type", content_type)
+        if is_fingerprinted(path) or "v" in self.request.arguments:
+            self.set_header("Cache-Control", IMMUTABLE_CACHE_CONTROL)
+            self.clear_header("Expires")
+
+    AppStaticFileHandler.set_extra_headers = set_extra_headers
+    _patched = True
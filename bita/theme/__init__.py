@@ -0,0 +1,119 @@
+"""Shared page theme: one minified, fingerprinted stylesheet and one navbar.
+
+The stylesheet (base.css) is minified once at import time and written to
+static/theme/ under a content-hashed name, so each rerun only sends a tiny
+``<link>`` instead of the full ``<style>`` block. The navbar HTML is built
+once per page and reused for every session.
+"""
+import functools
+import hashlib
+import os
+import re
+
+import streamlit as st
+
+from bita.logo import LOGO_SOURCE, logo_src
+from bita.static import static_path, static_serving_enabled, static_url
+from bita.tool_logos import logo_html
+
+CSS_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "base.css")
+OUTPUT_RELDIR = "theme"
+
+WHATSAPP_LINK = "https://wa.me/918982296014"
+
+# (label, in-page anchor on the home page). Other pages link back to "/".
+NAV_LINKS = (
+    ("Platform", "#services"),
+    ("Services", "#Servicess"),
+    ("Our Stars", "ourstar"),
+    ("About us", "#Aboutus"),
+    ("CONTACT US", "#contact-us-section"),
+)
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace. Enough for our hand-written CSS."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r"([{;])\s*([\w-]+)\s*:\s*", r"\1\2:", css)
+    css = css.replace(";}", "}")
+    return css.strip()
+
+
+def build_stylesheet(sources=(CSS_SOURCE,), name="theme"):
+    """Minify and concatenate ``sources`` into static/theme/<name>-<hash>.css; returns (css, relpath)."""
+    parts = []
+    for source in sources:
+        with open(source, encoding="utf-8") as f:
+            parts.append(minify_css(f.read()))
+    css = "".join(parts)
+    digest = hashlib.sha256(css.encode()).hexdigest()[:10]
+    relpath = f"{OUTPUT_RELDIR}/{name}-{digest}.css"
+    out_path = static_path(relpath)
+    if not os.path.exists(out_path):
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        tmp_path = out_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(css)
+        os.replace(tmp_path, out_path)
+    return css, relpath
+
+
+CSS, CSS_RELPATH = build_stylesheet()
+
+
+def theme_html():
+    """Markup that applies the theme: a stylesheet link, or inline CSS without static serving."""
+    if static_serving_enabled():
+        return f'<link rel="stylesheet" href="{static_url(CSS_RELPATH)}">'
+    return f"<style>{CSS}</style>"
+
+
+def inject_theme():
+    st.markdown(theme_html(), unsafe_allow_html=True)
+
+
+@functools.lru_cache(maxsize=16)
+def navbar_html(active_page, logo, whatsapp_icon, app_url="", page_links=True):
+    """Navbar markup for ``active_page`` ("home" keeps in-page anchors), a logo ``src`` and WhatsApp icon markup.
+
+    ``app_url`` prefixes links to other Streamlit pages; the static export
+    uses it to send "Our Stars" to the live app, and passes
+    ``page_links=False`` to leave those links out when there is no app.
+    """
+    links = []
+    for label, anchor in NAV_LINKS:
+        if anchor.startswith("#"):
+            href = anchor if active_page == "home" else "/"
+        elif not page_links:
+            continue
+        else:
+            href = f"{app_url.rstrip('/')}/{anchor}" if app_url else anchor
+        css_class = ' class="nav-cta"' if label == "CONTACT US" else ""
+        links.append(f'<a href="{href}"{css_class}>{label}</a>')
+    return (
+        '<div class="navbar">'
+        '<a href="/" class="logo-text">'
+        f'<img src="{logo}" alt="BITA Logo" style="height: 30px; margin-right: 5px; vertical-align: middle;">'
+        '</a>'
+        '<nav style="display: flex; gap: 30px; align-items: center;">'
+        f'<a href="{WHATSAPP_LINK}" target="_blank" class="whatsapp-link" title="Chat on WhatsApp">'
+        + whatsapp_icon +
+        '</a>'
+        + "".join(links)
+        + '</nav></div>'
+    )
+
+
+def render_navbar(active_page, logo_path=LOGO_SOURCE):
+    """Emit the fixed navbar, falling back to a text logo if the logo image is unusable."""
+    try:
+        whatsapp_icon = logo_html("whatsapp", 25, alt="WhatsApp", css_class="whatsapp-icon")
+        st.markdown(navbar_html(active_page, logo_src(logo_path), whatsapp_icon), unsafe_allow_html=True)
+    except FileNotFoundError:
+        st.error(f"Error: Image file not found at the specified path: {logo_path}")
+        st.markdown('<a href="/" class="logo-text">&lt;BITA&gt;</a>', unsafe_allow_html=True)
+    except Exception as e:
+        st.error(f"An unexpected error occurred while loading the image: {e}")
+        st.markdown('<a href="/" class="logo-text">&lt;BITA&gt;</a>', unsafe_allow_html=True)
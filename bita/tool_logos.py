@@ -0,0 +1,198 @@
+"""Self-hosted tool logos packed into one sprite sheet.
+
+The service cards and the navbar WhatsApp button used to hot-link six
+third-party images (up to 2048 px wide) to show them at 25-35 px, costing
+each visitor six cross-origin DNS/TLS handshakes. Now:
+
+    python -m bita.tool_logos fetch    # download missing logos into vendor/logos/ (needs network)
+    python -m bita.tool_logos build    # pack vendor/logos/ into static/logos/ and report
+
+At runtime the sprite is built once per process from ``vendor/logos/`` (no
+network needed) and ``logo_html`` emits a sprite cell. When a logo is not
+vendored, or static serving is off, it falls back to the remote URL. The
+deploy workflows run ``fetch`` and fail when a logo cannot be vendored
+(``fetch`` exits 1), so the fallback only covers local runs.
+"""
+import argparse
+import hashlib
+import html
+import io
+import os
+import sys
+import threading
+import time
+
+from PIL import Image, features
+
+from bita import ROOT_DIR
+from bita.static import static_path, static_serving_enabled, static_url
+
+VENDOR_DIR = os.path.join(ROOT_DIR, "vendor", "logos")
+OUTPUT_RELDIR = "logos"
+CELL_SIZE = 70  # px: 2x the largest display size (35 px on the service cards)
+VENDOR_EXTENSIONS = (".png", ".webp", ".jpg", ".jpeg")
+
+# name -> upstream URL; vendored copies are saved as vendor/logos/<name>.<ext>.
+REMOTE_LOGOS = {
+    "adf": "https://symbols.getvecta.com/stencil_27/36_data-factory.e36cbf28ed.png",
+    "azure": "https://upload.wikimedia.org/wikipedia/commons/thumb/f/fa/Microsoft_Azure.svg/2048px-Microsoft_Azure.svg.png",
+    "fabric": "https://davidalzamendi.com/wp-content/uploads/2023/05/Fabric_final_x256.png",
+    "powerbi": "https://upload.wikimedia.org/wikipedia/commons/thumb/c/cf/New_Power_BI_Logo.svg/1200px-New_Power_BI_Logo.svg.png",
+    "sql": "https://symbols.getvecta.com/stencil_27/79_sql-database-generic.494ff6320e.png",
+    "whatsapp": "https://upload.wikimedia.org/wikipedia/commons/thumb/6/6b/WhatsApp.svg/1200px-WhatsApp.svg.png",
+}
+
+# vendor/ is re-listed at most this often, so reruns do not touch the disk.
+REFRESH_SECONDS = 5.0
+
+_lock = threading.Lock()
+_built = {}
+_checked = {"at": None, "sprite": None}
+
+
+def vendored_files(vendor_dir=VENDOR_DIR):
+    """``{name: path}`` of the vendored logos we know about."""
+    try:
+        names = sorted(os.listdir(vendor_dir))
+    except FileNotFoundError:
+        return {}
+    files = {}
+    for filename in names:
+        name, ext = os.path.splitext(filename)
+        if name in REMOTE_LOGOS and ext.lower() in VENDOR_EXTENSIONS:
+            files.setdefault(name, os.path.join(vendor_dir, filename))
+    return files
+
+
+def fetch(force=False, vendor_dir=VENDOR_DIR, log=print):
+    """Download logos that are not vendored yet; returns the names that failed."""
+    import requests
+
+    os.makedirs(vendor_dir, exist_ok=True)
+    have = vendored_files(vendor_dir)
+    failed = []
+    for name, url in REMOTE_LOGOS.items():
+        if name in have and not force:
+            continue
+        try:
+            response = requests.get(url, timeout=20, headers={"User-Agent": "bita-build/1.0"})
+            response.raise_for_status()
+            Image.open(io.BytesIO(response.content)).verify()
+        except Exception as e:
+            log(f"failed {name}: {e}")
+            failed.append(name)
+            continue
+        with open(os.path.join(vendor_dir, f"{name}.png"), "wb") as f:
+            f.write(response.content)
+        log(f"fetched {name}: {len(response.content):,} bytes")
+    return failed
+
+
+def _cell(path, size=CELL_SIZE):
+    """The logo scaled to fit a transparent ``size`` x ``size`` square, centred."""
+    with Image.open(path) as opened:
+        image = opened.convert("RGBA")
+    image.thumbnail((size, size), Image.LANCZOS)
+    cell = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    cell.paste(image, ((size - image.width) // 2, (size - image.height) // 2))
+    return cell
+
+
+def build_sprite(files, size=CELL_SIZE):
+    """Pack ``files`` left to right into static/logos/sprite-<hash>; returns its description."""
+    names = sorted(files)
+    sheet = Image.new("RGBA", (size * len(names), size), (0, 0, 0, 0))
+    for index, name in enumerate(names):
+        sheet.paste(_cell(files[name], size), (index * size, 0))
+    buffer = io.BytesIO()
+    if features.check("webp"):
+        sheet.save(buffer, format="WEBP", lossless=True, method=6)
+        ext = "webp"
+    else:
+        sheet.save(buffer, format="PNG", optimize=True)
+        ext = "png"
+    data = buffer.getvalue()
+    relpath = f"{OUTPUT_RELDIR}/sprite-{hashlib.sha256(data).hexdigest()[:10]}.{ext}"
+    out_path = static_path(relpath)
+    if not os.path.exists(out_path):
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        tmp_path = out_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, out_path)
+    return {"relpath": relpath, "bytes": len(data), "cells": {name: i for i, name in enumerate(names)}}
+
+
+def get_sprite():
+    """This process's sprite, rebuilt only when the vendored files change; None if nothing is vendored."""
+    now = time.monotonic()
+    if _checked["at"] is not None and now - _checked["at"] < REFRESH_SECONDS:
+        return _checked["sprite"]
+    _checked["sprite"] = sprite = _load_sprite(VENDOR_DIR)
+    _checked["at"] = now
+    return sprite
+
+
+def _load_sprite(vendor_dir):
+    files = vendored_files(vendor_dir)
+    if not files:
+        return None
+    key = tuple((name, os.stat(path).st_mtime_ns) for name, path in sorted(files.items()))
+    sprite = _built.get(key)
+    if sprite is None:
+        with _lock:
+            sprite = _built.get(key)
+            if sprite is None:
+                sprite = build_sprite(files)
+                _built.clear()
+                _built[key] = sprite
+    return sprite
+
+
+def logo_html(name, size, alt="", css_class="", style=""):
+    """Markup showing logo ``name`` at ``size`` px: a sprite cell, or the remote ``<img>`` fallback."""
+    alt = html.escape(alt or name)
+    class_attr = f' class="{css_class}"' if css_class else ""
+    classes = f"tool-logo {css_class}".strip()
+    try:
+        sprite = get_sprite() if static_serving_enabled() else None
+    except OSError:
+        sprite = None  # unreadable vendored file: keep the page up with the remote logo
+    if sprite is None or name not in sprite["cells"]:
+        return f'<img src="{REMOTE_LOGOS[name]}" alt="{alt}"{class_attr} style="{style}">'
+    offset = sprite["cells"][name] * size
+    width = len(sprite["cells"]) * size
+    background = f'url({static_url(sprite["relpath"])}) -{offset}px 0 / {width}px {size}px no-repeat'
+    return (
+        f'<span role="img" aria-label="{alt}" class="{classes}" '
+        f'style="{style} width: {size}px; height: {size}px; background: {background};"></span>'
+    )
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bita.tool_logos", description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    fetch_cmd = sub.add_parser("fetch", help="download logos missing from vendor/logos/")
+    fetch_cmd.add_argument("--force", action="store_true", help="re-download every logo")
+    sub.add_parser("build", help="pack vendor/logos/ into the sprite sheet")
+    args = parser.parse_args(argv)
+
+    if args.command == "fetch":
+        return 1 if fetch(force=args.force) else 0
+
+    files = vendored_files()
+    missing = sorted(set(REMOTE_LOGOS) - set(files))
+    if not files:
+        print("no vendored logos; run `python -m bita.tool_logos fetch` first")
+        return 1
+    sprite = build_sprite(files)
+    source_bytes = sum(os.path.getsize(path) for path in files.values())
+    print(f"{len(files)} logos, {source_bytes:,} bytes -> {sprite['relpath']} ({sprite['bytes']:,} bytes)")
+    if missing:
+        print(f"not vendored (remote fallback): {', '.join(missing)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+"""Level-of-detail point-cloud viewer for 3d.py.
+
+    pyramid = LODPyramid(points)             # (n, 3) array; built once per dataset
+    level = pyramid.level_for(30_000)        # at most 30k evenly spread points
+    render_viewer(rotation_x=45, color="#4682B4", high_res=False)
+
+``bita.viewer3d.lod`` decimates the cloud on voxel grids of 8 to 1024 cells
+per axis, ``bita.viewer3d.render`` rotates and shades the chosen level
+with NumPy and draws it with a pydeck ``PointCloudLayer``, so a million
+point dataset costs the browser only the points it is asked to show.
+``bita.viewer3d.table`` does the same for the Data Table tab: sorting,
+filtering and paging run on index arrays and only the visible page is
+serialized. ``bita.viewer3d.ingest`` streams uploaded CSV / Parquet files
+into a float32 column cache keyed by file hash, and
+``bita.viewer3d.spatial`` answers box, radius and nearest-point queries
+on a uniform grid for the region both tabs show.
+"""
+from bita.viewer3d.ingest import IngestError, ingest
+from bita.viewer3d.lod import LODPyramid
+from bita.viewer3d.render import point_cloud_deck, render_points, rotation_matrix
+from bita.viewer3d.spatial import GridIndex, Selection
+from bita.viewer3d.table import ColumnTable
+from bita.viewer3d.ui import (
+    get_index, get_pyramid, get_table, render_table, render_viewer, select_dataset, select_region,
+)
+
+__all__ = [
+    "ColumnTable", "GridIndex", "IngestError", "LODPyramid", "Selection", "get_index", "get_pyramid", "get_table",
+    "ingest", "point_cloud_deck", "render_points", "render_table", "render_viewer", "rotation_matrix",
+    "select_dataset", "select_region",
+]
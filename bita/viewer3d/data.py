@@ -0,0 +1,17 @@
+"""Point data for the 3D viewer."""
+import numpy as np
+
+SAMPLE_POINTS = 1_000_000
+
+
+def sample_cloud(n=SAMPLE_POINTS, seed=0):
+    """A reproducible ``(n, 3)`` float32 terrain: rolling hills over a 100 x 100 square, with noise."""
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform(-50, 50, size=(n, 2)).astype(np.float32)
+    x, y = xy[:, 0], xy[:, 1]
+    z = (
+        12 * np.sin(x / 9) * np.cos(y / 11)
+        + 4 * np.sin((x + y) / 4)
+        + rng.normal(0, 0.4, size=n).astype(np.float32)
+    )
+    return np.column_stack([x, y, z]).astype(np.float32)
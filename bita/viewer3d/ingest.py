@@ -0,0 +1,303 @@
+"""Chunked ingest of CSV / Parquet point data into the viewer's binary column cache.
+
+    python -m bita.viewer3d.ingest model.parquet     # prints the cached dataset directory
+    BITA_VIEWER_DATA=<that directory> streamlit run 3d.py
+
+The file is read as a pipeline of generators, ``CHUNK_ROWS`` rows at a
+time (pandas' chunked CSV reader or Parquet record batches): each chunk is
+resolved to the X/Y/Z columns, converted to float32, stripped of rows with
+missing or non-finite values and appended to one raw file per column, so
+memory stays at a few chunks whatever the file size and no value is ever
+a Python object.
+
+The result is the ``ColumnTable.save`` layout (bita/viewer3d/table.py) in
+``<cache>/<sha256 of the file>/``, written under a temporary name and
+renamed when complete; the same file uploaded or ingested again is found
+by its hash and memory-mapped without parsing anything. The cache is kept
+under CACHE_MAX_BYTES (BITA_VIEWER_CACHE_BYTES, default 2 GB): after each
+ingest the least recently used datasets are removed until it fits, so
+uploads cannot fill the disk.
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from bita import ROOT_DIR
+from bita.viewer3d.table import POINT_COLUMNS, SCHEMA_FILE, column_path, write_schema
+
+CACHE_DIR = os.environ.get("BITA_VIEWER_CACHE") or os.path.join(ROOT_DIR, ".cache", "viewer3d")
+# Disk budget of the cache; a dataset's directory mtime records its last use.
+CACHE_MAX_BYTES = int(os.environ.get("BITA_VIEWER_CACHE_BYTES", 2 * 2 ** 30))
+# Partial ingests older than this were left behind by a worker that died mid-ingest.
+STALE_TMP_SECONDS = 60 * 60
+TMP_MARKER = ".tmp-"
+# Rows per chunk: 256k rows are 3 MB as float32, and a few times that while pandas parses them.
+CHUNK_ROWS = 262_144
+FORMATS = ("csv", "parquet")
+# Accepted source names per viewer column, compared case-insensitively.
+COLUMN_ALIASES = {
+    "X_Pos": ("x_pos", "x"),
+    "Y_Pos": ("y_pos", "y"),
+    "Z_Height": ("z_height", "z", "height"),
+}
+
+
+class IngestError(ValueError):
+    """The file cannot be read as point data (unknown format, missing or non-numeric columns, no rows)."""
+
+
+# --- Source ---
+def _open(source):
+    """(binary file object, whether we opened it) for a path or an already open file, e.g. an upload."""
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, "rb"), True
+    return source, False
+
+
+def file_digest(source):
+    """sha256 of the file's bytes, read in 1 MB blocks; the cache key of its dataset."""
+    f, owned = _open(source)
+    try:
+        f.seek(0)
+        digest = hashlib.sha256()
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+        return digest.hexdigest()
+    finally:
+        if owned:
+            f.close()
+        else:
+            f.seek(0)
+
+
+def file_format(name):
+    extension = os.path.splitext(name)[1].lower().lstrip(".")
+    extension = "parquet" if extension == "pq" else extension
+    if extension not in FORMATS:
+        raise IngestError(f"{name}: expected a .csv or .parquet file")
+    return extension
+
+
+def resolve_columns(names):
+    """Source column name for each of POINT_COLUMNS, in that order."""
+    by_lower = {str(name).strip().lower(): name for name in names}
+    resolved, missing = [], []
+    for column in POINT_COLUMNS:
+        aliases = [alias for alias in (column.lower(),) + COLUMN_ALIASES[column] if alias in by_lower]
+        if aliases:
+            resolved.append(by_lower[aliases[0]])
+        else:
+            missing.append(column)
+    if missing:
+        raise IngestError(f"missing column(s) {', '.join(missing)}; found {', '.join(map(str, names)) or 'none'}")
+    return resolved
+
+
+# --- Chunk pipeline ---
+def csv_chunks(f, chunk_rows=CHUNK_ROWS):
+    """(float32 (n, 3) array, fraction of the file read) per chunk of a CSV file."""
+    f.seek(0, os.SEEK_END)
+    size = f.tell() or 1
+    f.seek(0)
+    columns = resolve_columns(pd.read_csv(f, nrows=0).columns)
+    f.seek(0)
+    reader = pd.read_csv(f, usecols=columns, dtype={name: np.float32 for name in columns},
+                         chunksize=chunk_rows, engine="c")
+    try:
+        for frame in reader:
+            yield frame[columns].to_numpy(np.float32), min(f.tell() / size, 1.0)
+    except ValueError as error:  # a value that is not a number
+        raise IngestError(f"non-numeric value in {', '.join(columns)}: {error}") from None
+    finally:
+        reader.close()
+
+
+def parquet_chunks(f, chunk_rows=CHUNK_ROWS):
+    """(float32 (n, 3) array, fraction of the rows read) per record batch of a Parquet file."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    try:
+        parquet = pq.ParquetFile(f)
+    except pa.ArrowException as error:
+        raise IngestError(f"not a Parquet file: {error}") from None
+    columns = resolve_columns(parquet.schema_arrow.names)
+    for name in columns:
+        kind = parquet.schema_arrow.field(name).type
+        if not (pa.types.is_integer(kind) or pa.types.is_floating(kind)):
+            raise IngestError(f"column {name} is {kind}, not numeric")
+    total = parquet.metadata.num_rows or 1
+    done = 0
+    for batch in parquet.iter_batches(batch_size=chunk_rows, columns=columns):
+        chunk = np.empty((batch.num_rows, len(columns)), dtype=np.float32)
+        for axis in range(len(columns)):
+            # Nulls come back as NaN and are dropped with the other non-finite rows.
+            chunk[:, axis] = batch.column(axis).to_numpy(zero_copy_only=False)
+        done += batch.num_rows
+        yield chunk, done / total
+
+
+def finite_rows(chunks):
+    """The chunks without rows holding NaN or infinite values, plus the number of rows dropped."""
+    for chunk, fraction in chunks:
+        keep = np.isfinite(chunk).all(axis=1)
+        yield (chunk if keep.all() else chunk[keep]), fraction, len(chunk) - int(keep.sum())
+
+
+def read_chunks(f, fmt, chunk_rows=CHUNK_ROWS):
+    source = csv_chunks(f, chunk_rows) if fmt == "csv" else parquet_chunks(f, chunk_rows)
+    return finite_rows(source)
+
+
+# --- Cache ---
+def dataset_dir(digest, cache_dir=None):
+    return os.path.join(cache_dir or CACHE_DIR, digest)
+
+
+def cached_dataset(digest, cache_dir=None):
+    """The dataset directory for ``digest`` if a complete ingest is cached, else None; marks it as used."""
+    directory = dataset_dir(digest, cache_dir)
+    try:
+        os.utime(directory)
+    except OSError:
+        return None
+    return directory if os.path.exists(os.path.join(directory, SCHEMA_FILE)) else None
+
+
+def tree_size(directory):
+    """Bytes in the files under ``directory``."""
+    total = 0
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, filename))
+            except OSError:
+                pass
+    return total
+
+
+def prune(cache_dir=None, max_bytes=None, keep=None):
+    """Remove the least recently used datasets (never ``keep``) until the cache fits ``max_bytes``.
+
+    Also removes partial ingests older than STALE_TMP_SECONDS. Tables that
+    are already memory-mapped keep working: the OS frees removed files once
+    they are unmapped. Returns the bytes removed.
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    try:
+        names = os.listdir(cache_dir)
+    except FileNotFoundError:
+        return 0
+    now = time.time()
+    datasets, total, removed = [], 0, 0
+    for name in names:
+        path = os.path.join(cache_dir, name)
+        try:
+            used = os.stat(path).st_mtime
+        except OSError:
+            continue
+        size = tree_size(path)
+        if TMP_MARKER in name:
+            if now - used > STALE_TMP_SECONDS:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += size
+            continue
+        datasets.append((used, path, size))
+        total += size
+    keep = os.path.abspath(keep) if keep else None
+    for _, path, size in sorted(datasets):
+        if total <= max_bytes:
+            break
+        if os.path.abspath(path) == keep:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        removed += size
+    return removed
+
+
+def ingest(source, name=None, cache_dir=None, chunk_rows=CHUNK_ROWS, progress=None, digest=None, max_bytes=None):
+    """Cached dataset directory for ``source`` (a path or binary file), ingesting it first if needed.
+
+    ``progress(fraction, rows)`` is called after every chunk. ``name``
+    picks the format when ``source`` is a file object without one. A new
+    dataset then evicts older ones beyond ``max_bytes`` (see ``prune``).
+    """
+    name = name or getattr(source, "name", None) or str(source)
+    fmt = file_format(name)
+    f, owned = _open(source)
+    try:
+        digest = digest or file_digest(f)
+        directory = cached_dataset(digest, cache_dir)
+        if directory:
+            if progress:
+                progress(1.0, None)
+            return directory
+
+        directory = dataset_dir(digest, cache_dir)
+        tmp_dir = f"{directory}{TMP_MARKER}{uuid.uuid4().hex[:8]}"
+        os.makedirs(tmp_dir)
+        try:
+            rows = dropped = 0
+            outputs = [open(column_path(tmp_dir, column), "wb") for column in POINT_COLUMNS]
+            try:
+                for chunk, fraction, skipped in read_chunks(f, fmt, chunk_rows):
+                    for axis, out in enumerate(outputs):
+                        np.ascontiguousarray(chunk[:, axis]).tofile(out)
+                    rows += len(chunk)
+                    dropped += skipped
+                    if progress:
+                        progress(fraction, rows)
+            finally:
+                for out in outputs:
+                    out.close()
+            if not rows:
+                raise IngestError(f"{name}: no rows with finite {', '.join(POINT_COLUMNS)} values")
+            write_schema(tmp_dir, dict.fromkeys(POINT_COLUMNS, np.float32), rows,
+                         source=os.path.basename(name), sha256=digest, dropped=dropped)
+            try:
+                os.replace(tmp_dir, directory)
+            except OSError:  # another session finished the same file first
+                if not cached_dataset(digest, cache_dir):
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        prune(cache_dir, max_bytes, keep=directory)
+        return directory
+    finally:
+        if owned:
+            f.close()
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bita.viewer3d.ingest", description=__doc__.split("\n\n")[0])
+    parser.add_argument("path", help="CSV or Parquet file with X/Y/Z columns")
+    parser.add_argument("--cache", default=None, help=f"cache directory (default: {CACHE_DIR})")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="rows per chunk (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    def report(fraction, rows):
+        if rows is not None:
+            print(f"\r{fraction:6.1%}  {rows:,} rows", end="", file=sys.stderr, flush=True)
+
+    try:
+        directory = ingest(args.path, cache_dir=args.cache, chunk_rows=args.chunk_rows, progress=report)
+    except IngestError as error:
+        print(f"\n{error}", file=sys.stderr)
+        return 1
+    print(file=sys.stderr)
+    print(directory)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Level-of-detail pyramid for point clouds: voxel-grid decimation, built once per dataset.
+
+Level ``d`` snaps every point to a ``2**d`` cells-per-axis grid over the
+bounding box and keeps one point per occupied cell: the centroid of the
+points in it, weighted by how many original points each stands for. Levels
+are built bottom-up (each coarser grid merges the previous level's
+centroids, which gives the exact centroids of the original points), so the
+whole pyramid costs a few sorts of ever smaller arrays.
+
+Every level is stored in a fixed random order, so any prefix of it is an
+evenly spread sample. ``level_for(budget)`` therefore returns the first
+``budget`` points of the coarsest level that has at least that many: a
+zero-copy slice that fills the budget exactly, and the browser never
+receives more points than it was asked to draw.
+"""
+import collections
+
+import numpy as np
+
+MAX_DEPTH = 10  # 1024 cells per axis; keys need 3 * MAX_DEPTH bits
+MIN_DEPTH = 3
+# A coarser level is only kept if it drops at least this share of points.
+MIN_REDUCTION = 0.25
+SHUFFLE_SEED = 0
+
+Level = collections.namedtuple("Level", "depth points weights")
+Level.__doc__ = """One level: grid ``depth`` (None for the full-resolution points), float32 points and their weights."""
+
+
+def _cell_keys(points, lo, extent, depth):
+    """Integer key of the grid cell holding each point."""
+    cells = 1 << depth
+    index = ((points - lo) / extent * cells).astype(np.int64)
+    np.clip(index, 0, cells - 1, out=index)
+    return (index[:, 0] << (2 * depth)) | (index[:, 1] << depth) | index[:, 2]
+
+
+def decimate(points, weights, lo, extent, depth):
+    """Weighted centroid of ``points`` per occupied cell of a ``2**depth`` grid."""
+    keys = _cell_keys(points, lo, extent, depth)
+    _, inverse = np.unique(keys, return_inverse=True)
+    merged_weights = np.bincount(inverse, weights=weights)
+    merged = np.empty((merged_weights.size, 3), dtype=np.float32)
+    for axis in range(3):
+        merged[:, axis] = np.bincount(inverse, weights=points[:, axis] * weights) / merged_weights
+    return merged, merged_weights.astype(np.float32)
+
+
+class LODPyramid:
+    """Every level of detail of one point cloud, from the full points down to a few hundred."""
+
+    def __init__(self, points, max_depth=MAX_DEPTH, min_depth=MIN_DEPTH):
+        points = np.ascontiguousarray(points, dtype=np.float32)
+        if points.ndim != 2 or points.shape[1] != 3 or not len(points):
+            raise ValueError("expected a non-empty (n, 3) array of points")
+        self.lo = points.min(axis=0)
+        self.hi = points.max(axis=0)
+        # A flat axis still needs a non-zero cell size.
+        self.extent = np.maximum(self.hi - self.lo, np.float32(1e-6))
+        self.center = (self.lo + self.hi) / 2
+        self.radius = float(np.linalg.norm(self.hi - self.lo) / 2) or 1.0
+
+        weights = np.ones(len(points), dtype=np.float32)
+        levels = [Level(None, points, weights)]
+        current, current_weights = points, weights
+        for depth in range(max_depth, min_depth - 1, -1):
+            merged, merged_weights = decimate(current, current_weights, self.lo, self.extent, depth)
+            if len(merged) <= len(levels[-1].points) * (1 - MIN_REDUCTION):
+                levels.append(Level(depth, merged, merged_weights))
+            current, current_weights = merged, merged_weights
+        rng = np.random.default_rng(SHUFFLE_SEED)
+        self.levels = []  # coarse to fine
+        for level in reversed(levels):
+            order = rng.permutation(len(level.points))
+            self.levels.append(Level(level.depth, level.points[order], level.weights[order]))
+
+    @property
+    def count(self):
+        return len(self.levels[-1].points)
+
+    @property
+    def nbytes(self):
+        return sum(level.points.nbytes + level.weights.nbytes for level in self.levels)
+
+    def level_for(self, budget):
+        """At most ``budget`` points: a prefix of the coarsest level that has that many, else all points."""
+        budget = max(1, int(budget))
+        for level in self.levels:
+            if len(level.points) >= budget:
+                return Level(level.depth, level.points[:budget], level.weights[:budget])
+        return self.levels[-1]
@@ -0,0 +1,175 @@
+"""Point-cloud rendering: vectorized transforms and a pydeck ``PointCloudLayer`` in a tilted map view.
+
+Everything per point is one NumPy expression over the whole level: centring
+and scaling, the rotation (``points @ R.T``) and height shading. Only the
+level picked for the point budget is ever transformed or serialized.
+
+pydeck pretty-prints layer data (``indent=2``, about 150 bytes and 0.02 ms
+a point), so ``PointCloudDeck`` splices the points in as compact JSON
+instead: about 45 bytes a point.
+
+``GeometryCache`` memoizes that JSON per (budget, rotation, colour), so
+moving a control back to a recent value, or any rerun that leaves the
+controls alone, does no per-point work at all.
+
+``st.pydeck_chart`` drops the spec's ``views`` and always draws deck.gl's
+map view, so the points are metre offsets from a fixed origin, and pitch,
+bearing and zoom in the view state frame them around it.
+"""
+import collections
+import json
+import math
+import threading
+
+import numpy as np
+import pydeck as pdk
+
+# Half-size of the normalized model, in metres from the view's origin.
+MODEL_RADIUS = 100.0
+# deck.gl's COORDINATE_SYSTEM.METER_OFFSETS: positions are metres east, north and up from ``coordinate_origin``.
+METER_OFFSETS = 2
+ORIGIN = (0.0, 0.0)  # longitude, latitude
+# Metres per pixel at zoom 0 on the equator (deck.gl's world is 512 px wide there).
+METERS_PER_PIXEL_ZOOM0 = 40_075_016.686 / 512
+# Share of the chart height the model's diameter spans in the initial view.
+VIEW_FILL = 0.6
+VIEW_PITCH = 45  # degrees; deck.gl's map view allows up to 60
+VIEW_BEARING = 30
+# Decimals kept in the JSON sent to the browser; 0.01 units is far below a pixel.
+POSITION_DECIMALS = 2
+# Darkest shade, as a share of the base colour, at the lowest point.
+SHADE_FLOOR = 0.35
+# Rendered layer data kept by GeometryCache; 64 MB is ~50 standard or ~8 high-resolution renders.
+GEOMETRY_CACHE_BYTES = 64 * 2 ** 20
+
+_POSITION_FORMAT = f"%.{POSITION_DECIMALS}f"
+_ROW_FORMAT = '{"p":[' + ",".join([_POSITION_FORMAT] * 3) + '],"c":[%d,%d,%d]}'
+
+
+def rotation_matrix(x=0.0, y=0.0, z=0.0):
+    """3x3 rotation by ``x``, then ``y``, then ``z`` degrees about the fixed axes."""
+    ax, ay, az = (math.radians(angle) for angle in (x, y, z))
+    rx = np.array([[1, 0, 0], [0, math.cos(ax), -math.sin(ax)], [0, math.sin(ax), math.cos(ax)]])
+    ry = np.array([[math.cos(ay), 0, math.sin(ay)], [0, 1, 0], [-math.sin(ay), 0, math.cos(ay)]])
+    rz = np.array([[math.cos(az), -math.sin(az), 0], [math.sin(az), math.cos(az), 0], [0, 0, 1]])
+    return (rz @ ry @ rx).astype(np.float32)
+
+
+def transform(points, center, radius, rotation):
+    """Centre, scale to MODEL_RADIUS and rotate ``points`` in one pass; returns float32."""
+    scale = np.float32(MODEL_RADIUS / radius)
+    return ((points - center) * scale) @ rotation.T
+
+
+def hex_to_rgb(color):
+    color = color.lstrip("#")
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def shade(heights, base_rgb):
+    """uint8 RGB per point: ``base_rgb`` darkened towards the lowest ``heights``."""
+    low, high = float(heights.min()), float(heights.max())
+    t = (heights - low) / (high - low) if high > low else np.ones_like(heights)
+    factor = SHADE_FLOOR + (1 - SHADE_FLOOR) * t
+    return np.clip(factor[:, None] * np.asarray(base_rgb, dtype=np.float32), 0, 255).astype(np.uint8)
+
+
+def points_json(points, colors):
+    """Compact JSON records ``{"p": [x, y, z], "c": [r, g, b]}`` with rounded positions.
+
+    One %-format per point is about twice as fast as building dicts for
+    ``json.dumps``.
+    """
+    rows = np.column_stack([points.astype(np.float64), colors]).tolist()
+    return "[" + ",".join(_ROW_FORMAT % tuple(values) for values in rows) + "]"
+
+
+class PointCloudDeck(pdk.Deck):
+    """A ``pdk.Deck`` whose first layer's data is pre-serialized JSON, inserted verbatim by ``to_json``."""
+
+    _PLACEHOLDER = "__points__"
+
+    def to_json(self):
+        layer = self.layers[0]
+        data = layer.data
+        layer.data = self._PLACEHOLDER  # pydeck only ever sees (and escapes) a short string
+        try:
+            spec = super().to_json()
+        finally:
+            layer.data = data
+        return spec.replace(json.dumps(self._PLACEHOLDER), data, 1)
+
+
+def view_zoom(height, radius=MODEL_RADIUS, fill=VIEW_FILL):
+    """Map zoom at which a model ``2 * radius`` metres across spans ``fill`` of a ``height`` px chart."""
+    return math.log2(METERS_PER_PIXEL_ZOOM0 * height * fill / (2 * radius))
+
+
+def point_cloud_deck(data_json, point_size=2, height=520):
+    """A deck showing ``data_json`` (see ``points_json``) at ``ORIGIN``, seen from above at an angle."""
+    layer = pdk.Layer(
+        "PointCloudLayer",
+        id="points",  # a stable id lets the browser update the layer instead of recreating it
+        data=data_json,
+        get_position="p",
+        get_color="c",
+        get_normal=[0, 0, 1],
+        point_size=point_size,
+        coordinate_system=METER_OFFSETS,
+        coordinate_origin=list(ORIGIN),
+        pickable=False,
+    )
+    return PointCloudDeck(
+        layers=[layer],
+        initial_view_state=pdk.ViewState(longitude=ORIGIN[0], latitude=ORIGIN[1], zoom=view_zoom(height),
+                                         pitch=VIEW_PITCH, bearing=VIEW_BEARING, height=height),
+        map_provider=None,
+        map_style=None,
+        height=height,
+        tooltip=False,
+    )
+
+
+def render_points(pyramid, budget, rotation_x=0.0, color="#4682B4"):
+    """Layer data (JSON) and the ``Level`` used for ``pyramid`` at ``budget`` points, rotated and shaded."""
+    level = pyramid.level_for(budget)
+    points = transform(level.points, pyramid.center, pyramid.radius, rotation_matrix(x=rotation_x))
+    colors = shade(level.points[:, 2], hex_to_rgb(color))
+    return points_json(points, colors), level
+
+
+class GeometryCache:
+    """LRU of ``render_points`` results keyed by (budget, rotation, colour), bounded by total JSON bytes."""
+
+    def __init__(self, pyramid, max_bytes=GEOMETRY_CACHE_BYTES):
+        self.pyramid = pyramid
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, budget, rotation_x=0.0, color="#4682B4"):
+        """Same result as ``render_points(pyramid, budget, rotation_x, color)``, computed at most once while cached."""
+        key = (int(budget), float(rotation_x), color.lower())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        entry = render_points(self.pyramid, *key)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = entry
+                self.bytes += len(entry[0])
+            while self.bytes > self.max_bytes and len(self._entries) > 1:
+                _, (data, _) = self._entries.popitem(last=False)
+                self.bytes -= len(data)
+        return entry
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self.bytes, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,171 @@
+"""Uniform-grid spatial index: box, radius and k-nearest queries without scanning every point.
+
+    index = GridIndex(points)                          # (n, 3) array; built once per dataset
+    rows = index.box((0, 0, 0), (10, 10, 5))           # row numbers inside the box
+    rows = index.radius((5, 5, 1), 2.5)                # within 2.5 units of a point
+    rows, distances = index.nearest((5, 5, 1), k=10)   # closest first
+
+The bounding box is cut into cells of one size, chosen for about
+``POINTS_PER_CELL`` points each (flat axes, like a terrain's height, get a
+single layer). Points are stored sorted by cell, with ``offsets[c]`` the
+first position of cell ``c``; cells are numbered z-fastest, so the cells of
+a box that share an x and y column are one contiguous run of points. A box
+query gathers those runs and tests only the points in them, so its cost
+follows the number of points near the box, not the dataset size.
+
+``select(region)`` runs a query described by a hashable tuple and keeps
+the last few results as ``Selection`` records, which the 3D View and Data
+Table tabs both consume (bita/viewer3d/ui.py).
+"""
+import collections
+import math
+import threading
+
+import numpy as np
+
+POINTS_PER_CELL = 16
+# Cells per point at most, however unevenly the points are spread.
+MAX_CELLS_PER_POINT = 2
+SELECTION_CACHE_SIZE = 8
+
+Selection = collections.namedtuple("Selection", "region rows")
+Selection.__doc__ = """Result of ``GridIndex.select``: the ``region`` tuple and its row numbers, ascending."""
+
+
+class GridIndex:
+    """Points bucketed on a uniform grid over their bounding box."""
+
+    def __init__(self, points, points_per_cell=POINTS_PER_CELL):
+        points = np.asarray(points, dtype=np.float32)
+        if points.ndim != 2 or points.shape[1] != 3 or not len(points):
+            raise ValueError("expected a non-empty (n, 3) array of points")
+        self.count = len(points)
+        self.lo = points.min(axis=0).astype(np.float64)
+        self.hi = points.max(axis=0).astype(np.float64)
+        self.cell_size, self.shape = _grid(self.hi - self.lo, self.count, points_per_cell)
+
+        keys = self._cell_keys(points)
+        self.order = np.argsort(keys)  # row number of each stored point; queries sort their results anyway
+        self.points = points[self.order]
+        counts = np.bincount(keys, minlength=int(np.prod(self.shape)))
+        self.offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+        self._lock = threading.Lock()
+        self._selections = collections.OrderedDict()
+
+    @property
+    def nbytes(self):
+        return self.points.nbytes + self.order.nbytes + self.offsets.nbytes
+
+    def _cells(self, coords):
+        """Cell coordinate per axis of ``coords`` (any shape ending in 3), clipped to the grid."""
+        cells = np.floor((np.asarray(coords, dtype=np.float64) - self.lo) / self.cell_size).astype(np.int64)
+        return np.clip(cells, 0, np.asarray(self.shape) - 1)
+
+    def _cell_keys(self, points):
+        cells = self._cells(points)
+        _, ny, nz = self.shape
+        return (cells[:, 0] * ny + cells[:, 1]) * nz + cells[:, 2]
+
+    # --- Queries ---
+    def _candidates(self, lo, hi):
+        """Storage positions of the points in every cell the box ``lo``-``hi`` touches."""
+        lo, hi = np.asarray(lo, dtype=np.float64), np.asarray(hi, dtype=np.float64)
+        if (hi < self.lo).any() or (lo > self.hi).any():
+            return np.empty(0, dtype=np.int64)
+        (x0, y0, z0), (x1, y1, z1) = self._cells(lo), self._cells(hi)
+        _, ny, nz = self.shape
+        columns = (np.arange(x0, x1 + 1)[:, None] * ny + np.arange(y0, y1 + 1)).ravel() * nz
+        starts = self.offsets[columns + z0]
+        ends = self.offsets[columns + z1 + 1]
+        lengths = ends - starts
+        total = int(lengths.sum())
+        if not total:
+            return np.empty(0, dtype=np.int64)
+        # Concatenate the runs start..end without a Python loop.
+        shift = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return shift + np.arange(total, dtype=np.int64)
+
+    def box(self, lo, hi):
+        """Row numbers of the points with ``lo <= point <= hi`` on every axis, ascending."""
+        positions = self._candidates(lo, hi)
+        points = self.points[positions]
+        lo, hi = np.asarray(lo, dtype=np.float32), np.asarray(hi, dtype=np.float32)
+        inside = ((points >= lo) & (points <= hi)).all(axis=1)
+        return np.sort(self.order[positions[inside]])
+
+    def radius(self, center, radius):
+        """Row numbers of the points within ``radius`` of ``center``, ascending."""
+        center = np.asarray(center, dtype=np.float64)
+        positions = self._candidates(center - radius, center + radius)
+        inside = _squared_distances(self.points[positions], center) <= radius * radius
+        return np.sort(self.order[positions[inside]])
+
+    def nearest(self, point, k=1):
+        """Row numbers of the ``k`` points closest to ``point`` and their distances, closest first.
+
+        Searches a box around ``point`` that grows until it holds ``k``
+        points; the k-th distance found is then the box's final half-width,
+        so no point outside it can be closer.
+        """
+        k = min(int(k), self.count)
+        point = np.asarray(point, dtype=np.float64)
+        # Half-width expected to hold about k points, assuming they are spread evenly.
+        reach = float(self.cell_size) * max(1.0, (k / POINTS_PER_CELL) ** (1 / 3))
+        # Beyond this the box covers every point from anywhere.
+        limit = float(np.abs(np.stack([self.lo - point, self.hi - point])).max())
+        while True:
+            positions = self._candidates(point - reach, point + reach)
+            if len(positions) >= k:
+                distances = _squared_distances(self.points[positions], point)
+                nearest = np.argpartition(distances, k - 1)[:k] if k < len(positions) else np.arange(len(positions))
+                kth = math.sqrt(distances[nearest].max())
+                if kth <= reach or reach >= limit:
+                    order = nearest[np.argsort(distances[nearest], kind="stable")]
+                    return self.order[positions[order]], np.sqrt(distances[order])
+                reach = kth  # one more query at exactly the k-th distance settles it
+            else:
+                reach *= 2
+
+    def select(self, region):
+        """``Selection`` for ``region``: ``("box", lo, hi)``, ``("radius", center, r)`` or ``("nearest", point, k)``."""
+        with self._lock:
+            selection = self._selections.get(region)
+            if selection is not None:
+                self._selections.move_to_end(region)
+                return selection
+        kind, *args = region
+        if kind == "box":
+            rows = self.box(*args)
+        elif kind == "radius":
+            rows = self.radius(*args)
+        elif kind == "nearest":
+            rows = np.sort(self.nearest(*args)[0])
+        else:
+            raise ValueError(f"unknown region {kind!r}")
+        selection = Selection(region, rows)
+        with self._lock:
+            self._selections[region] = selection
+            while len(self._selections) > SELECTION_CACHE_SIZE:
+                self._selections.popitem(last=False)
+        return selection
+
+
+def _grid(extent, count, points_per_cell):
+    """Cell size and cells per axis for ``count`` points spread over ``extent``."""
+    flat = extent <= extent.max() * 1e-6
+    active = extent[~flat]
+    if not len(active):  # every point in one place
+        return 1.0, (1, 1, 1)
+    cells_wanted = max(1.0, count / points_per_cell)
+    size = float(np.prod(active) / cells_wanted) ** (1 / len(active))
+    while True:
+        shape = tuple(int(n) for n in np.where(flat, 1, np.maximum(1, np.ceil(extent / size))))
+        if np.prod(shape) <= max(1, count * MAX_CELLS_PER_POINT):
+            return size, shape
+        size *= 1.25
+
+
+def _squared_distances(points, center):
+    offsets = points - center
+    return np.einsum("ij,ij->i", offsets, offsets)
@@ -0,0 +1,165 @@
+"""Columnar table for the Data Table tab: sort, filter and paginate on the server.
+
+Columns are NumPy arrays (views into the viewer's points array, or raw
+column files memory-mapped from disk), so only the rows of the visible
+page are ever copied into a DataFrame and serialized to Arrow:
+
+    table = ColumnTable.from_points(points)
+    rows = table.query(sort_by="Z_Height", descending=True, filters={"X_Pos": (0, 10)})
+    frame = table.page(rows, page=0, page_size=50)
+
+The sort permutation of each column is computed once per table (a stable
+argsort), and the last few query results are kept, so paging through
+one query only slices an index array. A spatial ``Selection``
+(bita/viewer3d/spatial.py) narrows a query to its rows, which are then
+filtered and sorted on their own instead of across the whole table.
+"""
+import collections
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+ID_COLUMN = "ID"
+POINT_COLUMNS = ("X_Pos", "Y_Pos", "Z_Height")
+QUERY_CACHE_SIZE = 8
+PAGE_SIZES = (25, 50, 100, 250)
+SCHEMA_FILE = "columns.json"
+COLUMN_SUFFIX = ".bin"
+
+
+class ColumnTable:
+    """Equal-length named columns plus an implicit 1-based ``ID`` (the row number)."""
+
+    def __init__(self, columns):
+        self.columns = collections.OrderedDict(columns)
+        lengths = {len(values) for values in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"columns differ in length: {sorted(lengths)}")
+        self.rows = lengths.pop() if lengths else 0
+        self._lock = threading.Lock()
+        self._orders = {}
+        self._queries = collections.OrderedDict()
+
+    @classmethod
+    def from_points(cls, points, names=POINT_COLUMNS):
+        """Columns viewing an ``(n, 3)`` points array; nothing is copied."""
+        return cls((name, points[:, axis]) for axis, name in enumerate(names))
+
+    @property
+    def names(self):
+        return [ID_COLUMN] + list(self.columns)
+
+    # --- Storage ---
+    # One raw file per column plus columns.json, so writers can append chunk by chunk (bita/viewer3d/ingest.py).
+    def save(self, directory, **extra):
+        """Write each column to ``<directory>/<name>.bin`` so ``open`` can memory-map it."""
+        os.makedirs(directory, exist_ok=True)
+        for name, values in self.columns.items():
+            np.ascontiguousarray(values).tofile(column_path(directory, name))
+        write_schema(directory, {name: values.dtype for name, values in self.columns.items()}, self.rows, **extra)
+
+    @classmethod
+    def open(cls, directory, mmap=True):
+        """A table over a directory ``save`` (or the ingest) wrote; with ``mmap`` the OS pages columns in on demand."""
+        schema = read_schema(directory)
+        columns = []
+        for name, dtype in schema["columns"].items():
+            path = column_path(directory, name)
+            if mmap and schema["rows"]:
+                values = np.memmap(path, dtype=dtype, mode="r", shape=(schema["rows"],))
+            else:
+                values = np.fromfile(path, dtype=dtype, count=schema["rows"])
+            columns.append((name, values))
+        return cls(columns)
+
+    # --- Queries ---
+    def sort_order(self, name):
+        """Row indices sorting column ``name`` ascending; computed once per column."""
+        order = self._orders.get(name)
+        if order is None:
+            with self._lock:
+                order = self._orders.get(name)
+                if order is None:
+                    if name == ID_COLUMN:
+                        order = np.arange(self.rows, dtype=np.int64)
+                    else:
+                        order = np.argsort(self.columns[name], kind="stable")
+                    self._orders[name] = order
+        return order
+
+    def _mask(self, filters, rows=None):
+        """Which rows (all, or just ``rows``) pass every filter; None without filters."""
+        mask = None
+        for name, (low, high) in filters:
+            values = self.columns[name] if rows is None else self.columns[name][rows]
+            keep = np.ones(len(values), dtype=bool)
+            if low is not None:
+                keep &= values >= low
+            if high is not None:
+                keep &= values <= high
+            mask = keep if mask is None else mask & keep
+        return mask
+
+    def query(self, sort_by=ID_COLUMN, descending=False, filters=None, selection=None):
+        """Row indices matching ``filters`` (``{column: (low, high)}``, inclusive, None = open) in sort order.
+
+        With a ``selection`` only its rows are considered.
+        """
+        filters = tuple(sorted((filters or {}).items()))
+        key = (sort_by, descending, filters, selection.region if selection is not None else None)
+        with self._lock:
+            rows = self._queries.get(key)
+            if rows is not None:
+                self._queries.move_to_end(key)
+                return rows
+        if selection is None:
+            rows = self.sort_order(sort_by)
+            mask = self._mask(filters)
+            if mask is not None:
+                rows = rows[mask[rows]]
+        else:
+            rows = selection.rows  # ascending, i.e. already in ID order
+            mask = self._mask(filters, rows)
+            if mask is not None:
+                rows = rows[mask]
+            if sort_by != ID_COLUMN:
+                rows = rows[np.argsort(self.columns[sort_by][rows], kind="stable")]
+        if descending:
+            rows = rows[::-1]
+        with self._lock:
+            self._queries[key] = rows
+            while len(self._queries) > QUERY_CACHE_SIZE:
+                self._queries.popitem(last=False)
+        return rows
+
+    def page(self, rows, page, page_size):
+        """DataFrame of the ``page``-th window of ``rows``; only these rows are copied."""
+        window = rows[page * page_size:(page + 1) * page_size]
+        data = {ID_COLUMN: window + 1}
+        for name, values in self.columns.items():
+            data[name] = np.asarray(values[window])
+        return pd.DataFrame(data)
+
+
+def page_count(rows, page_size):
+    return max(1, -(-len(rows) // page_size))
+
+
+def column_path(directory, name):
+    return os.path.join(directory, name + COLUMN_SUFFIX)
+
+
+def write_schema(directory, dtypes, rows, **extra):
+    """columns.json: column names and dtypes in order, the row count and any ``extra`` details."""
+    schema = {"columns": {name: np.dtype(dtype).str for name, dtype in dtypes.items()}, "rows": int(rows)}
+    schema.update(extra)
+    with open(os.path.join(directory, SCHEMA_FILE), "w", encoding="utf-8") as f:
+        json.dump(schema, f, indent=2)
+
+
+def read_schema(directory):
+    with open(os.path.join(directory, SCHEMA_FILE), encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,199 @@
+"""Streamlit glue for the 3D viewer: dataset, LOD pyramid and table shared per dataset.
+
+Streamlit 1.31 has no fragments, so a control change still reruns all of
+3d.py; each tab is therefore a cheap lookup into process-wide caches. The
+dataset and pyramid are built once, the rendered geometry is memoized per
+(budget, rotation, colour) in ``GeometryCache``, and the table reuses its
+sort permutations and recent queries, serializing only one page.
+
+A session picks its dataset with the sidebar uploader; uploads are
+ingested once into the binary cache (bita/viewer3d/ingest.py) and every
+resource is then keyed by the cached directory, so sessions viewing the
+same file share one memory-mapped table and pyramid.
+
+The sidebar's region (a box, a radius or the nearest points around a
+position) is answered by the dataset's ``GridIndex``; both tabs then show
+only its rows, the 3D View through a pyramid of just those points.
+"""
+import os
+
+import numpy as np
+import streamlit as st
+
+from bita.viewer3d.data import SAMPLE_POINTS, sample_cloud
+from bita.viewer3d.ingest import IngestError, cached_dataset, file_digest, ingest
+from bita.viewer3d.lod import LODPyramid
+from bita.viewer3d.render import GeometryCache, point_cloud_deck
+from bita.viewer3d.spatial import GridIndex
+from bita.viewer3d.table import ID_COLUMN, PAGE_SIZES, POINT_COLUMNS, ColumnTable, page_count, read_schema
+
+# Points sent to the browser per render; "Enable High Resolution Rendering" picks the larger budget.
+STANDARD_POINTS = 30_000
+HIGH_RES_POINTS = 200_000
+# Datasets whose table, pyramid and rendered geometry stay loaded at once.
+DATASETS_KEPT = 4
+# Regions whose pyramid and rendered geometry stay loaded at once.
+REGIONS_KEPT = 4
+REGION_MODES = ("All points", "Box", "Within radius", "Nearest points")
+
+
+# --- Data ---
+@st.cache_resource(show_spinner="Loading point data...", max_entries=DATASETS_KEPT)
+def get_table(dataset=None):
+    """The cached ``dataset`` directory (memory-mapped), else $BITA_VIEWER_DATA, else the sample terrain."""
+    directory = dataset or os.environ.get("BITA_VIEWER_DATA")
+    if directory:
+        return ColumnTable.open(directory)
+    return ColumnTable.from_points(sample_cloud(int(os.environ.get("BITA_VIEWER_POINTS", SAMPLE_POINTS))))
+
+
+@st.cache_resource(show_spinner="Building level-of-detail pyramid...", max_entries=DATASETS_KEPT)
+def get_pyramid(dataset=None):
+    """The LOD pyramid of ``get_table(dataset)``'s X/Y/Z columns, built once per dataset."""
+    table = get_table(dataset)
+    return LODPyramid(np.column_stack([table.columns[name] for name in POINT_COLUMNS]))
+
+
+@st.cache_resource(show_spinner="Indexing points...", max_entries=DATASETS_KEPT)
+def get_index(dataset=None):
+    """The ``GridIndex`` of ``get_table(dataset)``'s X/Y/Z columns; row numbers match the table's."""
+    table = get_table(dataset)
+    return GridIndex(np.column_stack([table.columns[name] for name in POINT_COLUMNS]))
+
+
+def get_selection(dataset=None, region=None):
+    """The ``Selection`` for ``region`` (see ``select_region``), or None for every point."""
+    return get_index(dataset).select(region) if region else None
+
+
+@st.cache_resource(show_spinner="Building level-of-detail pyramid...", max_entries=REGIONS_KEPT)
+def get_region_pyramid(dataset, region):
+    """LOD pyramid of just the points in ``region``; None when it holds none."""
+    rows = get_selection(dataset, region).rows
+    if not len(rows):
+        return None
+    table = get_table(dataset)
+    if len(rows) == table.rows:  # e.g. the untouched box sliders
+        return get_pyramid(dataset)
+    return LODPyramid(np.column_stack([table.columns[name][rows] for name in POINT_COLUMNS]))
+
+
+@st.cache_resource(show_spinner=False, max_entries=REGIONS_KEPT)
+def get_geometry_cache(dataset=None, region=None):
+    pyramid = get_region_pyramid(dataset, region) if region else get_pyramid(dataset)
+    return GeometryCache(pyramid) if pyramid is not None else None
+
+
+def select_dataset():
+    """Uploader for CSV / Parquet model data; returns the cached dataset directory, or None for the default data."""
+    upload = st.file_uploader(
+        "Model Data (CSV or Parquet)", type=["csv", "parquet"], key="viewer_upload",
+        help="Needs X/Y/Z columns (X_Pos, Y_Pos, Z_Height or x, y, z). Leave empty for the sample terrain.",
+    )
+    if upload is None:
+        return None
+    ingested = st.session_state.setdefault("viewer_datasets", {})  # upload id -> file hash, so reruns skip hashing
+    digest = ingested.get(upload.file_id)
+    # None also when the cache evicted the dataset since (bita/viewer3d/ingest.py:prune); ingest it again.
+    directory = cached_dataset(digest) if digest else None
+    if directory is None:
+        bar = st.progress(0.0, text=f"Reading {upload.name}...")
+
+        def report(fraction, rows):
+            bar.progress(fraction, text=f"Reading {upload.name}: {rows:,} points" if rows else "Found in cache")
+
+        try:
+            digest = digest or file_digest(upload)
+            directory = ingest(upload, name=upload.name, progress=report, digest=digest)
+        except IngestError as error:
+            st.error(str(error))
+            return None
+        finally:
+            bar.empty()
+        ingested[upload.file_id] = digest
+    schema = read_schema(directory)
+    dropped = f"; {schema['dropped']:,} incomplete row(s) skipped" if schema.get("dropped") else ""
+    st.caption(f"{schema['rows']:,} points from {schema.get('source', 'upload')}{dropped}.")
+    return directory
+
+
+def select_region(dataset=None):
+    """Region controls; returns the ``GridIndex.select`` tuple for the choice, or None for every point."""
+    mode = st.radio("Region", REGION_MODES, key="region_mode")
+    if mode == REGION_MODES[0]:
+        return None
+    # The index answers the region anyway; its bounds spare building the LOD pyramid for the defaults.
+    index = get_index(dataset)
+    if mode == "Box":
+        bounds = [
+            st.slider(f"{name} range", float(low), float(high), (float(low), float(high)), key=f"region_{name}")
+            for name, low, high in zip(POINT_COLUMNS, index.lo, index.hi)
+        ]
+        region = ("box", tuple(low for low, _ in bounds), tuple(high for _, high in bounds))
+    else:
+        center = tuple(
+            float(st.number_input(name, value=round(float(value), 2), format="%.2f", key=f"region_center_{name}"))
+            for name, value in zip(POINT_COLUMNS, (index.lo + index.hi) / 2)
+        )
+        if mode == "Within radius":
+            reach = float(np.linalg.norm(index.hi - index.lo) / 2) or 1.0  # half the bounding box diagonal
+            radius = st.number_input("Radius", min_value=0.0, value=round(reach / 10, 2), key="region_radius")
+            region = ("radius", center, float(radius))
+        else:
+            k = st.number_input("Points", min_value=1, max_value=index.count, value=min(1000, index.count),
+                                key="region_k")
+            region = ("nearest", center, int(k))
+    st.caption(f"{len(get_selection(dataset, region).rows):,} of {index.count:,} points in the region.")
+    return region
+
+
+# --- 3D View ---
+def render_viewer(rotation_x=0.0, color="#4682B4", high_res=False, dataset=None, region=None):
+    """The point cloud (or its ``region``) at the budget for ``high_res``, rotated ``rotation_x`` degrees about X."""
+    geometry = get_geometry_cache(dataset, region)
+    if geometry is None:
+        st.info("No points in the selected region.")
+        return
+    data, level = geometry.get(HIGH_RES_POINTS if high_res else STANDARD_POINTS, rotation_x, color)
+    st.pydeck_chart(point_cloud_deck(data))
+    detail = "full resolution" if level.depth is None else f"{2 ** level.depth} cells per axis"
+    where = " in the region" if region else ""
+    st.caption(f"Showing {len(level.points):,} of {geometry.pyramid.count:,} points{where} ({detail}).")
+
+
+# --- Data Table ---
+def _filters():
+    """``{column: (low, high)}`` from the filter controls; empty bounds are open."""
+    column_box, low_box, high_box = st.columns(3)
+    name = column_box.selectbox("Filter column", ("None",) + POINT_COLUMNS, key="table_filter_column")
+    if name == "None":
+        return {}
+    low = low_box.number_input("Minimum", value=None, key="table_filter_low", placeholder="no limit")
+    high = high_box.number_input("Maximum", value=None, key="table_filter_high", placeholder="no limit")
+    return {name: (low, high)} if low is not None or high is not None else {}
+
+
+def render_table(dataset=None, region=None):
+    """One page of the table (or its ``region``); sorting, filtering and paging happen on index arrays."""
+    table = get_table(dataset)
+    selection = get_selection(dataset, region)
+    sort_box, order_box, size_box = st.columns(3)
+    sort_by = sort_box.selectbox("Sort by", table.names, key="table_sort")
+    descending = order_box.radio("Order", ("Ascending", "Descending"), horizontal=True, key="table_order") == "Descending"
+    page_size = size_box.selectbox("Rows per page", PAGE_SIZES, index=1, key="table_page_size")
+    filters = _filters()
+
+    rows = table.query(sort_by, descending, filters, selection)
+    pages = page_count(rows, page_size)
+    # The widget only reads session state, so clamping it here does not clash with a default value.
+    st.session_state.setdefault("table_page", 1)
+    if st.session_state.table_page > pages:
+        st.session_state.table_page = pages  # a narrower filter or larger page size shrank the table
+    page = st.number_input("Page", min_value=1, max_value=pages, key="table_page")
+
+    st.dataframe(table.page(rows, page - 1, page_size), hide_index=True, use_container_width=True)
+    first = (page - 1) * page_size
+    shown = f"Rows {first + 1:,}-{min(first + page_size, len(rows)):,} of {len(rows):,}" if len(rows) else "No rows"
+    shown += f" (page {page:,} of {pages:,})"
+    filtered = f", filtered from {table.rows:,}" if filters or selection is not None else ""
+    st.caption(f"{shown}{filtered}, sorted by {sort_by or ID_COLUMN}.")
@@ -0,0 +1,167 @@
+"""Start-up warm-up: fill every per-process asset cache before visitors arrive.
+
+    python -m bita.warmup                                   # warm and report timings
+    python -m bita.warmup run -- app.py --server.port 8502  # warm, then start Streamlit
+
+``run`` warms the caches in the server process itself and only then lets
+Streamlit bind its port. ``/_stcore/health`` therefore does not answer
+until the process is warm, so a load balancer or Azure slot swap that
+health-checks it never routes a visitor to a cold worker.
+
+Pages call ``ensure_warm()`` too, so a server started with plain
+``streamlit run`` warms the rest of the site in the background on its
+first session.
+"""
+import logging
+import sys
+import threading
+import time
+
+from bita import assets
+
+SLIDE_FOLDERS = ("HomeSlides", "ServicesSlides")
+PAGES = ("home", "ourstar")
+THREAD_NAME = "warm-up"
+
+_state = {"started": False, "done": threading.Event(), "report": None}
+_state_lock = threading.Lock()
+
+
+class _WarmupThreadFilter(logging.Filter):
+    """Drops Streamlit's "missing ScriptRunContext" warning for the warm-up thread.
+
+    The thread runs outside every session on purpose: a visitor's context
+    would receive any message a step emits and outlive their session.
+    """
+
+    def filter(self, record):
+        return not (record.threadName == THREAD_NAME and "missing ScriptRunContext" in str(record.msg))
+
+
+# --- Steps ---
+def warm_theme():
+    from bita import theme
+    from bita.logo import logo_src
+    from bita.tool_logos import get_sprite, logo_html
+
+    logo = logo_src()
+    sprite = get_sprite()
+    whatsapp_icon = logo_html("whatsapp", 25, alt="WhatsApp", css_class="whatsapp-icon")
+    for page in PAGES:
+        theme.navbar_html(page, logo, whatsapp_icon)
+    logos = f"{len(sprite['cells'])} tool logos in the sprite" if sprite else "tool logos not vendored"
+    return f"{len(theme.CSS):,} bytes of CSS, {logos}"
+
+
+def warm_content():
+    from bita.sections import get_home
+
+    home = get_home()
+    return f"content {home.version}: {len(home.cards)} cards, {len(home.decks)} slide decks"
+
+
+def warm_slides():
+    from bita.slides import get_catalog
+
+    assets.load_manifest()
+    slides = get_catalog().slides(list(assets.iter_sources(SLIDE_FOLDERS)))
+    with_variants = sum(1 for slide in slides if slide.picture)
+    return f"{len(slides)} slides, {with_variants} with responsive variants"
+
+
+def warm_gallery():
+    from bita.gallery import get_gallery
+
+    gallery = get_gallery()
+    images = gallery.images()
+    if gallery.missing:
+        return "no gallery folder"
+    return f"{len(images)} images indexed"
+
+
+STEPS = (
+    ("theme and logo", warm_theme),
+    ("content", warm_content),
+    ("slides", warm_slides),
+    ("gallery", warm_gallery),
+)
+
+
+def warm(log=None):
+    """Run every step; returns ``[(name, seconds, detail or error), ...]``. Failures do not stop the rest."""
+    report = []
+    for name, step in STEPS:
+        start = time.perf_counter()
+        try:
+            detail = step()
+        except Exception as e:  # a broken asset must not keep the site down
+            detail = f"failed: {e.__class__.__name__}: {e}"
+        report.append((name, time.perf_counter() - start, detail))
+        if log:
+            log(f"warm-up: {name:<15} {report[-1][1] * 1000:8.1f} ms  {detail}")
+    return report
+
+
+def ensure_warm(background=True):
+    """Warm this process once. Later calls (and every call after ``run``) return immediately."""
+    with _state_lock:
+        if _state["started"]:
+            return
+        _state["started"] = True
+
+    def target():
+        _state["report"] = warm()
+        _state["done"].set()
+
+    if background:
+        logging.getLogger("streamlit.runtime.scriptrunner.script_run_context").addFilter(_WarmupThreadFilter())
+        threading.Thread(target=target, name=THREAD_NAME, daemon=True).start()
+    else:
+        target()
+
+
+def is_warm():
+    return _state["done"].is_set()
+
+
+# --- CLI ---
+def _run_streamlit(args):
+    """``streamlit run <args>``, warming after Streamlit has read its config and before it binds."""
+    from streamlit.web import bootstrap, cli
+
+    start_server = bootstrap.run
+
+    def run(*run_args, **run_kwargs):
+        started = time.perf_counter()
+        ensure_warm(background=False)
+        for name, seconds, detail in _state["report"]:
+            print(f"warm-up: {name:<15} {seconds * 1000:8.1f} ms  {detail}")
+        print(f"warm-up: done in {time.perf_counter() - started:.2f} s; starting the server")
+        start_server(*run_args, **run_kwargs)
+
+    bootstrap.run = run
+    return cli.main(["run", *args], prog_name="streamlit")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["run"]:
+        args = argv[1:]
+        if args[:1] == ["--"]:
+            args = args[1:]
+        return _run_streamlit(args)
+    if argv:
+        print(__doc__.split("\n\n")[1])
+        return 2
+
+    started = time.perf_counter()
+    report = warm(log=print)
+    print(f"warm-up: done in {time.perf_counter() - started:.2f} s")
+    return 1 if any(detail.startswith("failed:") for _, _, detail in report) else 0
+
+
+if __name__ == "__main__":
+    # Run through the importable module so pages calling ensure_warm() see this process's state.
+    from bita.warmup import main as _main
+
+    sys.exit(_main())
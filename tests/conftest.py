@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+
+@pytest.fixture
+def stub():
+    """The local stub model API (bita/insights/stub_server.py): ``(server, state)``."""
+    from bita.insights.stub_server import serve
+
+    server, state = serve(delay=0.002)
+    yield server, state
+    server.shutdown()
+    server.server_close()
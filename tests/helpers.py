@@ -0,0 +1,42 @@
+"""Shared helpers for the insight tests (tests/test_insight_*.py)."""
+import threading
+import time
+
+from bita.insights.backends import GeminiBackend
+from bita.insights.client import InsightClient, make_session
+
+
+def make_client(server, cache=None, gate=None):
+    """A client for the stub model API ``server`` (see the ``stub`` fixture), without retries."""
+    backend = GeminiBackend("stub", make_session(), base_url=f"http://127.0.0.1:{server.server_port}")
+    return InsightClient(backend, cache=cache, gate=gate, max_retries=0)
+
+
+def run_all(calls):
+    """Run ``calls`` (functions) in threads started together; returns their results in order."""
+    results = [None] * len(calls)
+    barrier = threading.Barrier(len(calls))
+
+    def run(index, call):
+        barrier.wait()
+        results[index] = call()
+
+    threads = [threading.Thread(target=run, args=(i, call)) for i, call in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+    return results
+
+
+def generate(client, topic, session_id=None):
+    """Text and sources of one insight, read to the end."""
+    stream = client.stream_insight(topic, session_id=session_id)
+    return "".join(stream), stream.sources
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
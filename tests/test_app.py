@@ -0,0 +1,23 @@
+"""AppTest runs of the home page."""
+import os
+
+import pytest
+from streamlit.runtime.secrets import SECRETS_FILE_LOCS
+from streamlit.testing.v1 import AppTest
+
+from bita import ROOT_DIR
+
+APP = os.path.join(ROOT_DIR, "app.py")
+
+
+@pytest.fixture
+def no_api_key(monkeypatch):
+    if any(os.path.exists(path) for path in SECRETS_FILE_LOCS):
+        pytest.skip("a secrets.toml file is present")
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+
+
+def test_home_without_secrets_file_shows_no_error(no_api_key):
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    assert not at.exception
+    assert not at.error
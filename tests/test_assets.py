@@ -0,0 +1,34 @@
+"""The slide pipeline's manifest check."""
+import pytest
+from PIL import Image
+
+from bita import assets
+
+
+@pytest.fixture
+def slides(tmp_path, monkeypatch):
+    """A repository with one slide, built into a temporary static/."""
+    (tmp_path / "HomeSlides").mkdir()
+    Image.new("RGB", (1200, 600), "navy").save(tmp_path / "HomeSlides" / "1.png")
+    static_dir = tmp_path / "static"
+    monkeypatch.setattr(assets, "ROOT_DIR", str(tmp_path))
+    monkeypatch.setattr(assets, "STATIC_DIR", str(static_dir))
+    monkeypatch.setattr(assets, "OUTPUT_DIR", str(static_dir / assets.OUTPUT_RELDIR))
+    monkeypatch.setattr(assets, "MANIFEST_PATH", str(static_dir / assets.OUTPUT_RELDIR / "manifest.json"))
+    return tmp_path
+
+
+def test_check_uses_the_widths_the_manifest_was_built_with(slides):
+    manifest = assets.build(widths=(320, 640), log=lambda message: None)
+
+    assert manifest["widths"] == [320, 640]
+    assert {v["width"] for v in manifest["images"]["HomeSlides/1.png"]["variants"]} == {320, 640, 1200}
+    assert assets.check() == []
+    assert assets.check(widths=assets.WIDTHS) == ["HomeSlides/1.png"]
+
+
+def test_check_reports_a_changed_slide(slides):
+    assets.build(log=lambda message: None)
+    Image.new("RGB", (1200, 600), "teal").save(slides / "HomeSlides" / "1.png")
+
+    assert assets.check() == ["HomeSlides/1.png"]
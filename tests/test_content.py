@@ -0,0 +1,42 @@
+"""Content model: validation and the keep-serving-the-last-good-version reload."""
+import copy
+import json
+import os
+
+import pytest
+
+from bita.content import CONTENT_PATH, ContentError, ContentStore, validate
+from bita.sections import build_home
+
+
+@pytest.fixture
+def data():
+    with open(CONTENT_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_shipped_content_is_valid(data):
+    validate(data)
+
+
+def test_unknown_logo_is_rejected(data):
+    data["services"]["cards"][0]["logo"] = "no-such-logo"
+    with pytest.raises(ContentError, match="unknown logo"):
+        validate(data)
+
+
+def test_rejected_reload_keeps_last_good_version(tmp_path, data):
+    path = tmp_path / "home.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    store = ContentStore(str(path), refresh_seconds=0)
+    good = store.get()
+
+    bad = copy.deepcopy(data)
+    bad["services"]["cards"][0]["logo"] = "no-such-logo"
+    path.write_text(json.dumps(bad), encoding="utf-8")
+    os.utime(path, ns=(0, 0))  # a new mtime even on coarse filesystem clocks
+    content = store.get()
+
+    assert content.version == good.version
+    assert "unknown logo" in content.error
+    assert build_home(content).error == content.error
@@ -0,0 +1,21 @@
+"""The shared base64 cache."""
+import pytest
+
+from bita import encoding
+
+
+def test_failed_read_releases_its_key_lock(tmp_path, monkeypatch):
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG")
+    cache = encoding.EncodingCache()
+
+    def unreadable(path, size):
+        raise PermissionError(path)
+
+    monkeypatch.setattr(encoding, "_read_base64", unreadable)
+    with pytest.raises(PermissionError):
+        cache.get_base64(str(tmp_path / "logo.png"))
+    assert cache._key_locks == {}
+
+    monkeypatch.undo()
+    assert cache.get_base64(str(tmp_path / "logo.png")) == "iVBORw=="
+    assert cache._key_locks == {}
@@ -0,0 +1,34 @@
+"""Static export of the home page (python -m bita.export)."""
+import os
+import re
+
+import pytest
+
+from bita.export import export
+
+LINK_RE = re.compile(r'href="([^"]+)"')
+
+
+@pytest.fixture(scope="module")
+def exports(tmp_path_factory):
+    out = tmp_path_factory.mktemp("export")
+    pages = {}
+    for name, app_url in (("static", ""), ("linked", "https://app.example.com")):
+        export(str(out / name), app_url, log=lambda message: None)
+        with open(out / name / "index.html", encoding="utf-8") as f:
+            pages[name] = (out / name, f.read())
+    return pages
+
+
+@pytest.mark.parametrize("name", ["static", "linked"])
+def test_every_relative_link_resolves(exports, name):
+    out, page = exports[name]
+    for href in LINK_RE.findall(page):
+        if href.startswith(("#", "http://", "https://", "mailto:", "tel:", "data:")) or href == "/":
+            continue
+        assert os.path.exists(os.path.join(out, href.split("?")[0])), href
+
+
+def test_page_links_need_an_app_url(exports):
+    assert "Our Stars" not in exports["static"][1].split("</nav>")[0]
+    assert 'href="https://app.example.com/ourstar"' in exports["linked"][1]
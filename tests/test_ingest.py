@@ -0,0 +1,49 @@
+"""Chunked ingest into the viewer's column cache, and its disk budget."""
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bita.viewer3d.ingest import IngestError, cached_dataset, ingest, tree_size
+from bita.viewer3d.table import ColumnTable
+
+
+def write_points(path, rows, seed=0):
+    points = np.random.default_rng(seed).random((rows, 3), dtype=np.float32)
+    pd.DataFrame(points, columns=["x", "y", "height"]).to_csv(path, index=False)
+    return points
+
+
+def test_csv_is_ingested_in_chunks_and_reused(tmp_path):
+    points = write_points(tmp_path / "points.csv", 1000)
+    progress = []
+    directory = ingest(str(tmp_path / "points.csv"), cache_dir=str(tmp_path / "cache"), chunk_rows=300,
+                              progress=lambda fraction, rows: progress.append(rows))
+
+    table = ColumnTable.open(directory)
+    np.testing.assert_allclose(table.columns["Z_Height"], points[:, 2], rtol=1e-6)
+    assert progress == [300, 600, 900, 1000]
+    assert ingest(str(tmp_path / "points.csv"), cache_dir=str(tmp_path / "cache")) == directory
+
+
+def test_missing_columns_are_rejected(tmp_path):
+    with pytest.raises(IngestError, match="missing column"):
+        ingest(io.BytesIO(b"a,b\n1,2\n"), name="bad.csv", cache_dir=str(tmp_path))
+
+
+def test_least_recently_used_datasets_are_evicted(tmp_path):
+    cache = str(tmp_path / "cache")
+    directories = []
+    for seed in range(3):
+        write_points(tmp_path / f"{seed}.csv", 1000, seed)
+        directories.append(ingest(str(tmp_path / f"{seed}.csv"), cache_dir=cache))
+        os.utime(directories[-1], (seed, seed))  # distinct last-use times
+    one_dataset = tree_size(directories[0])
+
+    cached_dataset(os.path.basename(directories[0]), cache)  # using it makes it the most recent
+    write_points(tmp_path / "new.csv", 1000, 99)
+    newest = ingest(str(tmp_path / "new.csv"), cache_dir=cache, max_bytes=int(2.5 * one_dataset))
+
+    assert sorted(os.listdir(cache)) == sorted(os.path.basename(d) for d in (directories[0], newest))
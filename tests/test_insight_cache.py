@@ -0,0 +1,33 @@
+"""InsightCache through the client, against the local stub model API."""
+from helpers import generate, make_client, run_all, wait_for
+
+from bita.insights.cache import FRESH, InsightCache, cache_key
+
+
+def test_concurrent_identical_prompts_make_one_upstream_call(stub):
+    client = make_client(stub[0], cache=InsightCache())
+    results = run_all([lambda: generate(client, "Edge AI")] * 8)
+
+    assert stub[1].requests == 1
+    assert client.cache.counters["coalesced"] == 7
+    texts = {text for text, _ in results}
+    assert len(texts) == 1 and texts.pop().startswith("Edge AI is moving")
+    assert all(sources for _, sources in results)
+
+
+def test_stale_entry_is_served_then_refreshed(stub):
+    now = [1000.0]
+    client = make_client(stub[0], cache=InsightCache(ttl=10, stale_ttl=100, clock=lambda: now[0]))
+    first, _ = generate(client, "Edge AI")
+    key = cache_key("Edge AI", client.backend.system_prompt, client.backend.generation_config, client.backend.model)
+
+    now[0] += 50  # past the TTL, within the stale window
+    requests_before = stub[1].requests
+    stale = client.stream_insight("Edge AI")
+    assert stub[1].requests == requests_before  # answered before any upstream call
+    assert "".join(stale) == first
+    assert client.cache.counters["stale"] == 1
+
+    wait_for(lambda: client.cache.lookup(key)[1] == FRESH)
+    assert stub[1].requests == 2
+    assert client.cache.lookup(key)[0].created == now[0]
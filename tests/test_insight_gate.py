@@ -0,0 +1,48 @@
+"""OutboundGate through the client, against the local stub model API."""
+import threading
+import time
+
+from helpers import generate, make_client, run_all, wait_for
+
+from bita.insights.limiter import OutboundGate
+
+
+def test_rate_limit_is_respected(stub):
+    client = make_client(stub[0], gate=OutboundGate(qps=10, burst=1, max_in_flight=8))
+    run_all([lambda i=i: generate(client, f"topic {i}") for i in range(5)])
+
+    arrivals = sorted(at for at, _ in stub[1].received)
+    assert len(arrivals) == 5
+    # One call right away, then one per 0.1 s; allow for scheduling jitter.
+    assert arrivals[-1] - arrivals[0] >= 0.4 * 0.9
+    gaps = [b - a for a, b in zip(arrivals, arrivals[1:])]
+    assert min(gaps) >= 0.1 * 0.8
+
+
+def test_waiting_sessions_are_served_round_robin(stub):
+    gate = OutboundGate(qps=1000, burst=1000, max_in_flight=1)
+    client = make_client(stub[0], gate=gate)
+    gate.acquire("blocker")  # hold the only slot while both sessions queue up
+    threads = []
+    for session, count in (("A", 3), ("B", 3)):
+        for i in range(count):
+            thread = threading.Thread(target=generate, args=(client, f"{session}{i}", session))
+            thread.start()
+            threads.append(thread)
+            wait_for(lambda: gate.stats()["queue_depth"] == len(threads))
+    gate.release()
+    for thread in threads:
+        thread.join(30)
+
+    assert [topic for _, topic in stub[1].received] == ["A0", "B0", "A1", "B1", "A2", "B2"]
+
+
+def test_pause_holds_back_every_caller(stub):
+    gate = OutboundGate(qps=1000, burst=1000, max_in_flight=8)
+    client = make_client(stub[0], gate=gate)
+    gate.pause(0.3)
+    started = time.monotonic()
+    run_all([lambda i=i: generate(client, f"topic {i}", f"session {i}") for i in range(3)])
+
+    assert all(at - started >= 0.3 * 0.9 for at, _ in stub[1].received)
+    assert gate.stats()["pauses"] == 1
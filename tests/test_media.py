@@ -0,0 +1,44 @@
+"""Background transcoding: outputs are keyed by content hash and survive a restart."""
+import pytest
+from PIL import Image
+
+from bita import media, static
+
+
+@pytest.fixture
+def static_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(static, "STATIC_DIR", str(tmp_path / "static"))
+    monkeypatch.setattr(media, "_by_signature", {})
+    monkeypatch.setattr(media, "_by_digest", {})
+    return tmp_path / "static"
+
+
+def write_gif(path):
+    frames = [Image.new("RGB", (32, 16), color) for color in ("red", "green", "blue")]
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=100, loop=0)
+
+
+def new_process(monkeypatch):
+    """Forget the in-memory memo and fail on any encode, as a restarted worker that must reuse the files."""
+    monkeypatch.setattr(media, "_by_signature", {})
+    monkeypatch.setattr(media, "_by_digest", {})
+    monkeypatch.setattr(media, "_transcode", lambda source, digest: pytest.fail(f"re-encoded {source}"))
+
+
+def test_outputs_on_disk_are_reused_by_a_new_process(static_dir, tmp_path, monkeypatch):
+    write_gif(tmp_path / "banner.gif")
+    outputs = media.transcode(str(tmp_path / "banner.gif"))
+    assert (static_dir / outputs["image"]).exists()
+
+    new_process(monkeypatch)
+    assert media.transcode(str(tmp_path / "banner.gif")) == outputs
+
+
+def test_videos_on_disk_are_reused_with_their_poster(static_dir, tmp_path, monkeypatch):
+    write_gif(tmp_path / "banner.gif")
+    paths = media._output_paths(str(tmp_path / "banner.gif"), media.file_sha256(tmp_path / "banner.gif"))
+    for kind in ("poster", "mp4"):
+        media._write(paths[kind], b"encoded")
+
+    new_process(monkeypatch)
+    assert media.transcode(str(tmp_path / "banner.gif")) == {"image": paths["poster"], "videos": [paths["mp4"]]}
@@ -0,0 +1,37 @@
+"""Profiles always hand the run context's _enqueue back, however the run ends."""
+from streamlit.testing.v1 import AppTest
+
+
+def _page():
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    from bita.profiling import start_profile
+
+    enqueue = get_script_run_ctx()._enqueue
+    st.session_state.setdefault("enqueue_names", []).append(enqueue.__name__)
+    with start_profile("test") as profile:
+        profile.mark("first")
+        st.write("counted")
+        if st.session_state.get("stop"):
+            st.stop()
+        if st.session_state.get("fail"):
+            raise RuntimeError("boom")
+        profile.mark("second")
+
+
+def test_enqueue_restored_after_stop_and_exception(monkeypatch):
+    monkeypatch.setenv("BITA_PROFILE", "1")
+    at = AppTest.from_function(_page)
+    at.session_state["stop"] = True
+    at.run()
+    at.session_state["stop"] = False
+    at.session_state["fail"] = True
+    at.run()
+    assert at.exception
+    at.session_state["fail"] = False
+    at.run()
+    assert not at.exception
+    names = at.session_state["enqueue_names"]
+    assert len(names) == 3
+    assert "counting_enqueue" not in names
@@ -0,0 +1,37 @@
+"""Content-Type and caching headers of files served from static/ by Streamlit's handler."""
+import tempfile
+
+import tornado.testing
+import tornado.web
+from streamlit.web.server.app_static_file_handler import AppStaticFileHandler
+
+from bita import assets, media
+from bita.static import IMMUTABLE_CACHE_CONTROL, install_static_headers
+
+# Every extension the asset builders write under static/, with the type browsers need.
+EXPECTED_TYPES = {
+    **{"." + fmt: mime for fmt, mime in assets.MIME_TYPES.items()},
+    **media.MIME_TYPES,
+    ".png": "image/png",
+    ".css": "text/css",
+}
+
+
+class StaticHeadersTest(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self):
+        install_static_headers()
+        self.root = self.enterContext(tempfile.TemporaryDirectory())
+        for extension in EXPECTED_TYPES:
+            with open(f"{self.root}/asset-0123456789{extension}", "wb") as f:
+                f.write(b"\0" * 16)
+        return tornado.web.Application([(r"/app/static/(.*)", AppStaticFileHandler, {"path": self.root})])
+
+    def test_content_types(self):
+        for extension, mime in EXPECTED_TYPES.items():
+            response = self.fetch(f"/app/static/asset-0123456789{extension}")
+            self.assertEqual(response.code, 200, extension)
+            self.assertEqual(response.headers["Content-Type"].split(";")[0], mime, extension)
+
+    def test_fingerprinted_files_are_immutable(self):
+        response = self.fetch("/app/static/asset-0123456789.avif")
+        self.assertEqual(response.headers["Cache-Control"], IMMUTABLE_CACHE_CONTROL)
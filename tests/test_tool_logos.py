@@ -0,0 +1,37 @@
+"""The logo sprite, built from a vendored directory without any network access."""
+import pytest
+from PIL import Image
+
+from bita import static, tool_logos
+
+
+@pytest.fixture
+def vendored(tmp_path, monkeypatch):
+    vendor_dir = tmp_path / "vendor"
+    vendor_dir.mkdir()
+    for name, color in (("azure", "blue"), ("sql", "red")):
+        Image.new("RGB", (300, 150), color).save(vendor_dir / f"{name}.png")
+    monkeypatch.setattr(tool_logos, "VENDOR_DIR", str(vendor_dir))
+    monkeypatch.setattr(tool_logos, "_built", {})
+    monkeypatch.setattr(tool_logos, "_checked", {"at": None, "sprite": None})
+    monkeypatch.setattr(static, "STATIC_DIR", str(tmp_path / "static"))
+    monkeypatch.setattr(tool_logos, "static_serving_enabled", lambda: True)
+    return tmp_path
+
+
+def test_sprite_packs_the_vendored_logos(vendored):
+    sprite = tool_logos.get_sprite()
+
+    assert sprite["cells"] == {"azure": 0, "sql": 1}
+    with Image.open(vendored / "static" / sprite["relpath"]) as sheet:
+        assert sheet.size == (2 * tool_logos.CELL_SIZE, tool_logos.CELL_SIZE)
+        assert sheet.getpixel((tool_logos.CELL_SIZE + tool_logos.CELL_SIZE // 2, tool_logos.CELL_SIZE // 2))[:3] == (255, 0, 0)
+
+
+def test_logo_html_uses_the_sprite_and_falls_back_for_missing_logos(vendored):
+    html = tool_logos.logo_html("sql", 35, alt="SQL")
+
+    assert tool_logos.get_sprite()["relpath"] in html
+    assert "-35px 0 / 70px 35px" in html
+    assert tool_logos.REMOTE_LOGOS["sql"] not in html
+    assert f'src="{tool_logos.REMOTE_LOGOS["adf"]}"' in tool_logos.logo_html("adf", 35)
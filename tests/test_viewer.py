@@ -0,0 +1,65 @@
+"""The 3D viewer: its deck spec, and AppTest runs of 3d.py on a small sample terrain."""
+import json
+import math
+import os
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from bita import ROOT_DIR
+from bita.viewer3d import render, ui
+
+VIEWER = os.path.join(ROOT_DIR, "3d.py")
+
+
+@pytest.fixture
+def viewer(monkeypatch):
+    monkeypatch.setenv("BITA_VIEWER_POINTS", "3000")
+    at = AppTest.from_file(VIEWER, default_timeout=60).run()
+    assert not at.exception
+    return at
+
+
+def test_deck_works_in_the_map_view_streamlit_draws():
+    spec = json.loads(render.point_cloud_deck('[{"p":[0,0,0],"c":[0,0,0]}]', height=520).to_json())
+    layer, view = spec["layers"][0], spec["initialViewState"]
+
+    # st.pydeck_chart deletes "views", so the layer must not rely on a custom view's coordinates.
+    assert layer["coordinateSystem"] == render.METER_OFFSETS
+    assert (view["longitude"], view["latitude"]) == tuple(layer["coordinateOrigin"])
+    assert view["pitch"] and view["height"] == 520
+    pixels_per_metre = 2 ** view["zoom"] / render.METERS_PER_PIXEL_ZOOM0
+    assert math.isclose(2 * render.MODEL_RADIUS * pixels_per_metre, 520 * render.VIEW_FILL)
+
+
+def test_larger_page_size_clamps_the_page_without_a_warning(viewer):
+    page = viewer.number_input(key="table_page")
+    page.set_value(page.max).run()
+    viewer.selectbox(key="table_page_size").set_value(250).run()
+
+    assert viewer.number_input(key="table_page").value == 12
+    assert not viewer.warning
+    assert not viewer.exception
+
+
+def _region_controls():
+    import streamlit as st
+
+    from bita.viewer3d import select_region
+
+    st.session_state.region = select_region()
+
+
+@pytest.mark.parametrize("mode", ["Box", "Within radius", "Nearest points"])
+def test_region_controls_do_not_build_the_pyramid(monkeypatch, mode):
+    built = []
+    monkeypatch.setenv("BITA_VIEWER_POINTS", "3000")
+    monkeypatch.setattr(ui, "LODPyramid", lambda points: built.append(len(points)))
+    st.cache_resource.clear()
+    at = AppTest.from_function(_region_controls, default_timeout=60).run()
+    at.radio(key="region_mode").set_value(mode).run()
+
+    assert not at.exception
+    assert at.session_state["region"][0] in ("box", "radius", "nearest")
+    assert built == []
@@ -0,0 +1,45 @@
+"""The background warm-up runs outside every session."""
+import logging
+import threading
+
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from streamlit.testing.v1 import AppTest
+
+from bita import warmup
+
+
+def _page():
+    from bita.warmup import ensure_warm
+
+    ensure_warm()
+
+
+def test_warmup_thread_has_no_session_context(monkeypatch):
+    contexts = []
+    monkeypatch.setattr(warmup, "_state", {"started": False, "done": threading.Event(), "report": None})
+    monkeypatch.setattr(warmup, "warm", lambda: contexts.append(get_script_run_ctx(suppress_warning=True)))
+
+    AppTest.from_function(_page).run()
+    assert warmup._state["done"].wait(5)
+    assert contexts == [None]
+
+
+def test_missing_context_warning_is_dropped_only_for_the_warmup_thread(monkeypatch):
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger("streamlit.runtime.scriptrunner.script_run_context")
+    quiet = warmup._WarmupThreadFilter()
+    logger.addHandler(handler)
+    logger.addFilter(quiet)
+    monkeypatch.setattr(runtime, "exists", lambda: True)
+    try:
+        for name in (warmup.THREAD_NAME, "other"):
+            thread = threading.Thread(target=get_script_run_ctx, name=name)
+            thread.start()
+            thread.join()
+    finally:
+        logger.removeHandler(handler)
+        logger.removeFilter(quiet)
+    assert [record.threadName for record in records] == ["other"]